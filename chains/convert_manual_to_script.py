@@ -1,160 +1,185 @@
 from pathlib import Path
+import asyncio
+import hashlib
 import json
-from typing import Dict, List, Optional
-from dataclasses import dataclass
-from langchain.prompts import PromptTemplate
-from langchain.chat_models import ChatOpenAI
-from langchain.chains import LLMChain
-import yaml
+import re
+from typing import Dict, Optional, Tuple
 import os
 from .test_generation_manager import TestGenerationManager, TestComponents
 
-from utils.framework_analyzer import FrameworkAnalysis
+from utils.cache_dir import tree_cache_dir
+from utils.file_cache import cached_load, write_atomic
+from utils.har_prune import prune_har, prune_dom
+from utils.llm_cache import cache_key
+from utils.manual_test import parse_manual_test
+from utils.prompt_loader import load_prompt
+from utils.serialization import dumps_json, to_yaml_interned, to_json, load_json_file
 
+# "- HAR Recording: [path]" / "- DOM Snapshot: [path]" lines under Related Files
+RELATED_FILE_PATTERN = re.compile(
+    r'(HAR Recording|DOM Snapshot):[ \t]*\[?([^\]\n]+?)\]?[ \t]*$', re.MULTILINE
+)
 
-@dataclass
-class TestComponents:
-    feature_file: str
-    step_definitions: str
-    page_objects: Dict[str, str]
-    page_objects_updates: Optional[str] = None
+# Page objects, and the PageObjects.ts updates keyed by a hash of their page
+# set, generated by earlier runs; kept in the framework's tree_cache_dir
+PAGE_OBJECTS_CACHE = "page_objects.json"
+PAGE_UPDATES_CACHE = "page_objects_updates.json"
+# Entries kept per cache; each holds a full set of generated sources
+GENERATION_CACHE_SIZE = 32
+
+
+def _related_files(manual_test: dict) -> Dict[str, str]:
+    """Map 'Related Files' labels to their paths in one scan"""
+    return dict(RELATED_FILE_PATTERN.findall(manual_test.get('Related Files', '')))
 
 
 def load_manual_test(path: str) -> dict:
     """Load manual test from file"""
-    with open(path) as f:
-        return yaml.safe_load(f)
+    return cached_load(path, parse_manual_test)
+
+
+def _load_pruned_har(path: str) -> Optional[dict]:
+    return prune_har(load_json_file(path))
+
+
+def _load_pruned_dom(path: str) -> Optional[dict]:
+    return prune_dom(load_json_file(path))
 
 
 def load_har_data(path: Optional[str]) -> Optional[dict]:
     """Load HAR recording data if available"""
     if not path or not os.path.exists(path):
         return None
-    with open(path) as f:
-        return json.load(f)
+    return cached_load(path, _load_pruned_har)
 
 
 def load_dom_snapshot(path: Optional[str]) -> Optional[dict]:
     """Load DOM snapshot data if available"""
     if not path or not os.path.exists(path):
         return None
-    with open(path) as f:
-        return json.load(f)
+    return cached_load(path, _load_pruned_dom)
 
 
 def load_prompts() -> Dict[str, str]:
     """Load all prompt templates"""
     prompts_dir = Path("prompts")
     return {
-        "feature": (prompts_dir / "feature_file_prompt.md").read_text(),
-        "step_definition": (prompts_dir / "step_definition_prompt.md").read_text(),
-        "test_generation": (prompts_dir / "test_generation_prompt.md").read_text()
+        "feature": load_prompt(prompts_dir / "feature_file_prompt.md"),
+        "step_definition": load_prompt(prompts_dir / "step_definition_prompt.md"),
+        "test_generation": load_prompt(prompts_dir / "test_generation_prompt.md")
     }
 
 
-def generate_feature_file(
+def _load_generation_cache(cache_path: Path) -> dict:
+    try:
+        return load_json_file(str(cache_path))
+    except (OSError, ValueError):
+        return {}
+
+
+def _store_generation_cache(cache_path: Path, key: str, value) -> None:
+    """Add one entry, keeping only the GENERATION_CACHE_SIZE newest"""
+    # Re-read so entries saved by a concurrent run aren't lost
+    entries = _load_generation_cache(cache_path)
+    entries.pop(key, None)
+    entries[key] = value
+    # Insertion order is age order, so the oldest entries go first
+    for stale_key in list(entries)[:-GENERATION_CACHE_SIZE]:
+        del entries[stale_key]
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(cache_path, dumps_json(entries).encode("utf-8"))
+    except OSError:
+        # Caching is best effort; generation already succeeded
+        pass
+
+
+async def _cached_page_objects(
+    manager: TestGenerationManager,
     manual_test: dict,
-    llm_chain: LLMChain,
-    prompts: Dict[str, str]
-) -> str:
-    """Generate feature file content"""
-    feature_prompt = PromptTemplate(
-        template=prompts["feature"],
-        input_variables=["manual_test"]
+    framework_analysis: dict,
+    dom_snapshot: Optional[dict],
+    base_dir: Path
+) -> Dict[str, str]:
+    """
+    Generate page objects, reusing a previous run's result for identical inputs
+
+    Keyed by the prompt, model settings and serialized inputs.
+    """
+    cache_path = tree_cache_dir(base_dir) / PAGE_OBJECTS_CACHE
+    codey = manager.codey_client
+    key = cache_key(
+        prompt=manager.prompts["page_object"],
+        manual_test=to_yaml_interned(manual_test),
+        framework_analysis=to_yaml_interned(framework_analysis),
+        dom_snapshot=to_json(dom_snapshot),
+        model=codey.model_name,
+        temperature=codey.temperature,
+        max_output_tokens=codey.max_output_tokens
     )
-    feature_chain = LLMChain(llm=llm_chain.llm, prompt=feature_prompt)
-    return feature_chain.predict(manual_test=yaml.dump(manual_test))
+    cached = _load_generation_cache(cache_path).get(key)
+    if cached is not None:
+        return cached
 
-
-def generate_step_definitions(
-    manual_test: dict,
-    framework_analysis: FrameworkAnalysis,
-    llm_chain: LLMChain,
-    prompts: Dict[str, str],
-    har_data: Optional[dict] = None,
-    dom_snapshot: Optional[dict] = None
-) -> str:
-    """Generate step definitions"""
-    step_prompt = PromptTemplate(
-        template=prompts["step_definition"],
-        input_variables=["manual_test", "framework_analysis", "har_data", "dom_snapshot"]
-    )
-    step_chain = LLMChain(llm=llm_chain.llm, prompt=step_prompt)
-    return step_chain.predict(
-        manual_test=yaml.dump(manual_test),
-        framework_analysis=yaml.dump(framework_analysis),
-        har_data=yaml.dump(har_data) if har_data else "None",
-        dom_snapshot=yaml.dump(dom_snapshot) if dom_snapshot else "None"
+    page_objects = await asyncio.to_thread(
+        manager.generate_page_objects, manual_test, framework_analysis, dom_snapshot
     )
+    _store_generation_cache(cache_path, key, page_objects)
+    return page_objects
 
 
-def generate_page_objects(
-    manual_test: dict,
-    framework_analysis: FrameworkAnalysis,
-    llm_chain: LLMChain,
-    prompts: Dict[str, str],
-    dom_snapshot: Optional[dict] = None
-) -> Dict[str, str]:
-    """Generate page objects"""
-    page_prompt = PromptTemplate(
-        template=prompts["test_generation"],
-        input_variables=["manual_test", "framework_analysis", "dom_snapshot"]
-    )
-    page_chain = LLMChain(llm=llm_chain.llm, prompt=page_prompt)
-    page_objects_content = page_chain.predict(
-        manual_test=yaml.dump(manual_test),
-        framework_analysis=yaml.dump(framework_analysis),
-        dom_snapshot=yaml.dump(dom_snapshot) if dom_snapshot else "None"
-    )
-    
-    # Parse the generated content into individual page objects
-    pages = {}
-    current_page = []
-    current_name = None
-    
-    for line in page_objects_content.split('\n'):
-        if line.startswith('// PAGE:'):
-            if current_name and current_page:
-                pages[current_name] = '\n'.join(current_page)
-                current_page = []
-            current_name = line[8:].strip()
-        else:
-            current_page.append(line)
-            
-    if current_name and current_page:
-        pages[current_name] = '\n'.join(current_page)
-        
-    return pages
-
-
-def update_page_objects_file(
-    framework_analysis: FrameworkAnalysis,
+def _page_set_hash(new_pages: Dict[str, str]) -> str:
+    payload = json.dumps(new_pages, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+async def update_page_objects_file(
+    manager: TestGenerationManager,
+    framework_analysis: dict,
     new_pages: Dict[str, str],
-    llm_chain: LLMChain,
-    prompts: Dict[str, str]
+    base_dir: Path
 ) -> Optional[str]:
     """Generate updates for PageObjects.ts"""
     if not new_pages:
         return None
-        
-    update_prompt = PromptTemplate(
-        template=prompts["test_generation"],
-        input_variables=["framework_analysis", "new_pages"]
+
+    # Skip the LLM call when this exact page set was already processed
+    cache_path = tree_cache_dir(base_dir) / PAGE_UPDATES_CACHE
+    pages_hash = _page_set_hash(new_pages)
+    cached = _load_generation_cache(cache_path).get(pages_hash)
+    if cached is not None:
+        return cached
+
+    updates = await asyncio.to_thread(
+        manager.generate_page_objects_updates, framework_analysis, new_pages
     )
-    update_chain = LLMChain(llm=llm_chain.llm, prompt=update_prompt)
-    return update_chain.predict(
-        framework_analysis=yaml.dump(framework_analysis),
-        new_pages=yaml.dump(new_pages)
+    _store_generation_cache(cache_path, pages_hash, updates)
+    return updates
+
+
+async def _page_objects_with_updates(
+    manager: TestGenerationManager,
+    manual_test: dict,
+    framework_analysis: dict,
+    dom_snapshot: Optional[dict],
+    base_dir: Path
+) -> Tuple[Dict[str, str], Optional[str]]:
+    """Generate page objects, then the PageObjects.ts updates that register them"""
+    page_objects = await _cached_page_objects(
+        manager, manual_test, framework_analysis, dom_snapshot, base_dir
     )
+    updates = await update_page_objects_file(manager, framework_analysis, page_objects, base_dir)
+    return page_objects, updates
 
 
-def generate_feature_and_steps(
+async def agenerate_feature_and_steps(
     manual_test_path: str,
     framework_analysis: dict,
     project_id: Optional[str] = None,
-    location: str = "us-central1"
+    location: str = "us-central1",
+    base_dir: str | Path = "."
 ) -> TestComponents:
-    """Main function to generate test components using Codey API"""
+    """Generate test components, running the independent LLM calls concurrently"""
     # Get GCP project ID from environment if not provided
     if not project_id:
         project_id = os.getenv('GCP_PROJECT_ID')
@@ -164,27 +189,53 @@ def generate_feature_and_steps(
     # Load manual test
     manual_test = load_manual_test(manual_test_path)
     
-    # Load related files if available
-    har_path = manual_test.get('Related Files', '').split('HAR Recording: ')[1].split('\n')[0].strip('[]') if 'Related Files' in manual_test else None
-    dom_path = manual_test.get('Related Files', '').split('DOM Snapshot: ')[1].split('\n')[0].strip('[]') if 'Related Files' in manual_test else None
+    # Load related files if available; their paths are relative to base_dir
+    base_dir = Path(base_dir)
+    related_files = _related_files(manual_test)
+    har_path = related_files.get('HAR Recording')
+    dom_path = related_files.get('DOM Snapshot')
     
-    har_data = load_har_data(har_path)
-    dom_snapshot = load_dom_snapshot(dom_path)
+    har_data = load_har_data(str(base_dir / har_path) if har_path else None)
+    dom_snapshot = load_dom_snapshot(str(base_dir / dom_path) if dom_path else None)
     
     # Initialize test generation manager
-    manager = TestGenerationManager(project_id=project_id, location=location)
-    
-    # Generate components
-    feature_content = manager.generate_feature_file(manual_test)
-    step_definitions = manager.generate_step_definitions(
-        manual_test, framework_analysis, har_data, dom_snapshot
+    manager = TestGenerationManager(
+        project_id=project_id,
+        location=location,
+        prompts_dir=base_dir / "prompts"
     )
-    page_objects = manager.generate_page_objects(
-        manual_test, framework_analysis, dom_snapshot
+    
+    # Feature, step and page generation don't depend on each other, so
+    # overlap their LLM round-trips instead of waiting on each in turn
+    feature_content, step_definitions, (page_objects, page_objects_updates) = await asyncio.gather(
+        asyncio.to_thread(manager.generate_feature_file, manual_test),
+        asyncio.to_thread(
+            manager.generate_step_definitions,
+            manual_test, framework_analysis, har_data, dom_snapshot
+        ),
+        _page_objects_with_updates(manager, manual_test, framework_analysis, dom_snapshot, base_dir)
     )
     
     return TestComponents(
         feature_file=feature_content,
         step_definitions=step_definitions,
-        page_objects=page_objects
+        page_objects=page_objects,
+        page_objects_updates=page_objects_updates
     )
+
+
+def generate_feature_and_steps(
+    manual_test_path: str,
+    framework_analysis: dict,
+    project_id: Optional[str] = None,
+    location: str = "us-central1",
+    base_dir: str | Path = "."
+) -> TestComponents:
+    """Main function to generate test components using Codey API"""
+    return asyncio.run(agenerate_feature_and_steps(
+        manual_test_path,
+        framework_analysis,
+        project_id=project_id,
+        location=location,
+        base_dir=base_dir
+    ))
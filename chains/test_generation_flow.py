@@ -1,11 +1,24 @@
 from pathlib import Path
+from functools import lru_cache
+import re
 import yaml
 from typing import Dict, Optional
 from dataclasses import dataclass
 from langchain.chat_models import ChatOpenAI
-from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 
+from utils.prompt_loader import load_prompt, get_prompt_template
+from utils.serialization import to_yaml
+
+# "Endpoint: <url>" anywhere on a line, and "key: value" split on the first colon
+ENDPOINT_PATTERN = re.compile(r'Endpoint:[ \t]*(.*?)[ \t]*$', re.MULTILINE)
+KEY_VALUE_PATTERN = re.compile(r'^[ \t]*([^:\n]*?)[ \t]*:[ \t]*(.*?)[ \t]*$', re.MULTILINE)
+
+@lru_cache(maxsize=None)
+def get_llm(temperature: float = 0.2) -> ChatOpenAI:
+    """Shared ChatOpenAI client so its HTTP connection pool is reused across calls"""
+    return ChatOpenAI(temperature=temperature)
+
 @dataclass
 class TestGenerationInput:
     manual_test: dict
@@ -18,10 +31,6 @@ class GeneratedFeature:
     content: str
     metadata: dict  # Stores technical details extracted from manual test
 
-def load_prompt(prompt_file: Path) -> str:
-    """Load prompt template from file"""
-    return prompt_file.read_text()
-
 def extract_technical_details(manual_test: dict) -> dict:
     """Extract technical implementation details from manual test"""
     technical_details = {
@@ -34,45 +43,39 @@ def extract_technical_details(manual_test: dict) -> dict:
     
     # Extract API endpoints
     if "API Details" in manual_test:
-        for line in manual_test["API Details"].split("\n"):
-            if "Endpoint:" in line:
-                technical_details["api_endpoints"].append(
-                    line.split("Endpoint:")[1].strip()
-                )
+        technical_details["api_endpoints"].extend(
+            ENDPOINT_PATTERN.findall(manual_test["API Details"])
+        )
     
     # Extract validation rules
     if "Validation Rules" in manual_test:
-        for line in manual_test["Validation Rules"].split("\n"):
-            if ":" in line:
-                key, value = line.split(":", 1)
-                technical_details["validation_rules"][key.strip()] = value.strip()
+        technical_details["validation_rules"].update(
+            KEY_VALUE_PATTERN.findall(manual_test["Validation Rules"])
+        )
     
     # Extract formatting rules
     if "Data Format" in manual_test:
-        for line in manual_test["Data Format"].split("\n"):
-            if ":" in line:
-                key, value = line.split(":", 1)
-                technical_details["formatting_rules"][key.strip()] = value.strip()
+        technical_details["formatting_rules"].update(
+            KEY_VALUE_PATTERN.findall(manual_test["Data Format"])
+        )
     
     return technical_details
 
 def generate_feature_file(
     input_data: TestGenerationInput,
-    feature_prompt_template: str
+    feature_prompt_template: str,
+    llm: Optional[ChatOpenAI] = None
 ) -> GeneratedFeature:
     """Generate feature file from manual test"""
     
     # Initialize LLM chain
-    llm = ChatOpenAI(temperature=0.2)
-    prompt = PromptTemplate(
-        template=feature_prompt_template,
-        input_variables=["manual_test"]
-    )
+    llm = llm or get_llm()
+    prompt = get_prompt_template(feature_prompt_template, ("manual_test",))
     chain = LLMChain(llm=llm, prompt=prompt)
     
     # Generate feature file
     feature_content = chain.predict(
-        manual_test=yaml.dump(input_data.manual_test)
+        manual_test=to_yaml(input_data.manual_test)
     )
     
     # Extract technical details for step definition generation
@@ -86,23 +89,24 @@ def generate_feature_file(
 def generate_step_definitions(
     feature: GeneratedFeature,
     input_data: TestGenerationInput,
-    step_prompt_template: str
+    step_prompt_template: str,
+    llm: Optional[ChatOpenAI] = None
 ) -> str:
     """Generate step definitions using both feature and manual test details"""
     
     # Initialize LLM chain
-    llm = ChatOpenAI(temperature=0.2)
-    prompt = PromptTemplate(
-        template=step_prompt_template,
-        input_variables=["feature_file", "technical_details", "framework_config"]
+    llm = llm or get_llm()
+    prompt = get_prompt_template(
+        step_prompt_template,
+        ("feature_file", "technical_details", "framework_config")
     )
     chain = LLMChain(llm=llm, prompt=prompt)
     
     # Generate step definitions
     return chain.predict(
         feature_file=feature.content,
-        technical_details=yaml.dump(feature.metadata),
-        framework_config=yaml.dump(input_data.framework_config)
+        technical_details=to_yaml(feature.metadata),
+        framework_config=to_yaml(input_data.framework_config)
     )
 
 def generate_test_components(
@@ -128,14 +132,17 @@ def generate_test_components(
     feature_prompt = load_prompt(prompts_dir / "feature_file_prompt.md")
     step_prompt = load_prompt(prompts_dir / "step_definition_prompt.md")
     
+    llm = get_llm()
+    
     # Generate feature file with technical details
-    feature = generate_feature_file(input_data, feature_prompt)
+    feature = generate_feature_file(input_data, feature_prompt, llm)
     
     # Generate step definitions using both feature and technical details
     step_definitions = generate_step_definitions(
         feature,
         input_data,
-        step_prompt
+        step_prompt,
+        llm
     )
     
     return feature.content, step_definitions 
\ No newline at end of file
@@ -1,32 +1,34 @@
-import yaml
 from pathlib import Path
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 from utils.codey_client import CodeyClient
+from utils.prompt_loader import load_prompt_dir
+from utils.serialization import to_yaml, to_yaml_interned, to_json
+
+IMPORT_PREFIXES = ("import ", "from ")
 
 @dataclass
 class TestComponents:
     feature_file: str
     step_definitions: str
     page_objects: Dict[str, str]
-    page_objects_updates: Optional[Dict[str, str]] = None
+    page_objects_updates: Optional[str] = None
 
 class TestGenerationManager:
-    def __init__(self, project_id: str, location: str = "us-central1"):
+    def __init__(self, project_id: str, location: str = "us-central1", prompts_dir: Path = Path("prompts")):
         self.codey_client = CodeyClient(
             project_id=project_id,
             location=location,
             max_output_tokens=1024,
             temperature=0.2
         )
+        self.prompts_dir = Path(prompts_dir)
         self.prompts = {}
         self.load_prompts()
 
     def load_prompts(self):
         """Load all prompt templates"""
-        prompts_dir = Path("prompts")
-        for prompt_file in prompts_dir.glob("*.md"):
-            self.prompts[prompt_file.stem] = prompt_file.read_text()
+        self.prompts.update(load_prompt_dir(self.prompts_dir))
 
     def generate_feature_file(self, manual_test: dict) -> str:
         """Generate feature file in chunks if needed"""
@@ -39,7 +41,7 @@ class TestGenerationManager:
         feature_contents = self.codey_client.predict_in_chunks(
             system_prompt=system_prompt,
             user_messages=[
-                f"{self.prompts['feature_file']}\n\nManual Test Section:\n{yaml.dump(section)}"
+                f"{self.prompts['feature_file']}\n\nManual Test Section:\n{to_yaml(section)}"
                 for section in sections
             ]
         )
@@ -58,15 +60,21 @@ class TestGenerationManager:
         # Break down into smaller chunks based on scenarios
         scenarios = self._extract_scenarios(manual_test)
         
+        # Context shared by every scenario is serialized once; HAR and DOM
+        # are JSON on disk so they skip the YAML round-trip
+        shared_context = (
+            f"Framework Analysis:\n{to_yaml_interned(framework_analysis)}\n"
+            f"HAR Data:\n{to_json(har_data)}\n"
+            f"DOM Snapshot:\n{to_json(dom_snapshot)}"
+        )
+        
         # Generate step definitions for each scenario
         step_contents = self.codey_client.predict_in_chunks(
             system_prompt=system_prompt,
             user_messages=[
                 f"{self.prompts['step_definition']}\n\n"
-                f"Scenario:\n{yaml.dump(scenario)}\n"
-                f"Framework Analysis:\n{yaml.dump(framework_analysis)}\n"
-                f"HAR Data:\n{yaml.dump(har_data) if har_data else 'None'}\n"
-                f"DOM Snapshot:\n{yaml.dump(dom_snapshot) if dom_snapshot else 'None'}"
+                f"Scenario:\n{to_yaml(scenario)}\n"
+                f"{shared_context}"
                 for scenario in scenarios
             ]
         )
@@ -84,33 +92,56 @@ class TestGenerationManager:
         # Extract pages and their elements
         pages = self._extract_pages(manual_test, dom_snapshot)
         
-        # Generate page objects for each page
-        page_contents = {}
-        for page_name, page_data in pages.items():
-            content = self.codey_client.predict(
-                system_prompt=system_prompt,
-                user_message=f"{self.prompts['page_object']}\n\n"
-                            f"Page:\n{yaml.dump(page_data)}\n"
-                            f"Framework Analysis:\n{yaml.dump(framework_analysis)}"
-            )
-            page_contents[page_name] = content
+        # Generate page objects for all pages in one batch
+        framework_yaml = to_yaml_interned(framework_analysis)
+        page_contents = self.codey_client.predict_in_chunks(
+            system_prompt=system_prompt,
+            user_messages=[
+                f"{self.prompts['page_object']}\n\n"
+                f"Page:\n{to_yaml(page_data)}\n"
+                f"Framework Analysis:\n{framework_yaml}"
+                for page_data in pages.values()
+            ]
+        )
             
-        return page_contents
+        return dict(zip(pages, page_contents))
+
+    def generate_page_objects_updates(self,
+                                      framework_analysis: dict,
+                                      page_objects: Dict[str, str]) -> Optional[str]:
+        """Generate the PageObjects.ts getters that expose new page objects"""
+        if not page_objects:
+            return None
+        system_prompt = "You are a test automation expert. Generate PageObjects.ts getters for the new Playwright page objects."
+
+        return self.codey_client.predict(
+            system_prompt=system_prompt,
+            user_message=(
+                f"Framework Analysis:\n{to_yaml_interned(framework_analysis)}\n"
+                f"New Pages:\n{to_yaml(page_objects)}"
+            )
+        )
 
     def _split_manual_test(self, manual_test: dict) -> List[dict]:
         """Split manual test into smaller chunks if needed"""
+        # Serialize each key once; a section's size is the sum of its keys
+        sizes = {key: len(to_yaml({key: value})) for key, value in manual_test.items()}
+        
         # If manual test is small enough, return as single chunk
-        if len(yaml.dump(manual_test)) < 2000:
+        if sum(sizes.values()) < 2000:
             return [manual_test]
             
         sections = []
         current_section = {}
+        current_size = 0
         
         for key, value in manual_test.items():
             current_section[key] = value
-            if len(yaml.dump(current_section)) >= 2000:
+            current_size += sizes[key]
+            if current_size >= 2000:
                 sections.append(current_section)
                 current_section = {}
+                current_size = 0
                 
         if current_section:
             sections.append(current_section)
@@ -164,12 +195,11 @@ class TestGenerationManager:
         
         for content in contents:
             # Extract and deduplicate imports
-            lines = content.split("\n")
-            for line in lines:
-                if line.startswith("import ") or line.startswith("from "):
+            for line in content.split("\n"):
+                if line.startswith(IMPORT_PREFIXES):
                     imports.add(line)
                 else:
                     combined.append(line)
                     
-        # Combine with imports at top
+        # Combine with imports at top; only the few unique imports get sorted
         return "\n".join(sorted(imports)) + "\n\n" + "\n".join(combined) 
\ No newline at end of file
@@ -1,6 +1,6 @@
 from pathlib import Path
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 
 
 @dataclass
@@ -16,7 +16,13 @@ class FrameworkConfig:
     @classmethod
     def from_base_path(cls, base_path: str | Path):
         """Create config instance with all paths relative to base_path"""
-        return cls()
+        base_path = Path(base_path)
+        defaults = cls()
+        return cls(**{
+            field.name: base_path / getattr(defaults, field.name)
+            if getattr(defaults, field.name) is not None else None
+            for field in fields(cls)
+        })
 
 
 def load_framework_config(framework_path: str | Path) -> FrameworkConfig:
@@ -1,14 +1,34 @@
+import asyncio
 from pathlib import Path
-import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
-from langchain.chat_models import ChatOpenAI
+from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
-from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from utils.http_client import shared_http_client
+from utils.llm_cache import enable_langchain_cache
+from utils.structured_output import astream_tool_arguments, with_validated_output
+from utils.serialization import dumps_json, load_json_file
+
+# Template files are small, so writing them is mostly waiting on the filesystem
+MAX_WRITE_WORKERS = 32
+
+
+@lru_cache(maxsize=None)
+def _write_executor() -> ThreadPoolExecutor:
+    """One thread pool for template file writes, shared by every call in the process"""
+    return ThreadPoolExecutor(max_workers=MAX_WRITE_WORKERS, thread_name_prefix="template-write")
+
+
+def _write_text(write: Tuple[Path, str]) -> None:
+    path, content = write
+    path.write_text(content)
 
 class TemplateType(str, Enum):
     REACT = "react"
@@ -33,8 +53,13 @@ class GenAITemplateGenerator:
         self.llm = ChatOpenAI(
             temperature=0.2,
             model="gpt-4",
-            openai_api_key=openai_api_key
+            openai_api_key=openai_api_key,
+            http_client=shared_http_client()
         )
+        # Schema-constrained variant so replies always parse into the model;
+        # full templates are streamed through astream_tool_arguments instead
+        self.component_llm = with_validated_output(self.llm, ComponentTemplate)
+        enable_langchain_cache()
         self._setup_prompts()
 
     def _setup_prompts(self):
@@ -80,53 +105,102 @@ class GenAITemplateGenerator:
         testing_requirements: Dict[str, any]
     ) -> MFETemplate:
         """Generate a complete MFE template"""
-        
-        # Get template structure from AI
-        response = self.llm.predict_messages([
+        return asyncio.run(self.agenerate_mfe_template(
+            output_path, framework, features, testing_requirements
+        ))
+
+    async def agenerate_mfe_template(
+        self,
+        output_path: Path,
+        framework: TemplateType,
+        features: List[str],
+        testing_requirements: Dict[str, any]
+    ) -> MFETemplate:
+        """
+        Generate a complete MFE template, writing files while the reply streams
+
+        Each component is written as soon as the next one starts, so disk
+        writes overlap the remaining generation. Directory READMEs and config
+        files are written once the whole reply has been validated: tool-call
+        arguments needn't follow schema key order, so a partially streamed
+        config file can't be told apart from a finished one.
+        """
+        messages = [
             ("system", "Generate MFE template structure"),
             ("human", f"""
             Framework: {framework.value}
-            Features: {json.dumps(features)}
-            Testing: {json.dumps(testing_requirements)}
+            Features: {dumps_json(features)}
+            Testing: {dumps_json(testing_requirements)}
             """)
-        ])
-
-        parser = PydanticOutputParser(pydantic_object=MFETemplate)
-        template = parser.parse(response.content)
-
-        # Create the template structure
-        self._create_template_structure(output_path, template)
-        
+        ]
+        components_path = output_path / 'src' / 'components'
+        write_tasks = []
+        components_written = 0
+
+        def schedule(writes: List[Tuple[Path, str]]):
+            write_tasks.append(asyncio.create_task(asyncio.to_thread(self._write_files, writes)))
+
+        raw = ""
+        async for raw, arguments in astream_tool_arguments(self.llm, MFETemplate, messages):
+            if "base_components" not in arguments:
+                continue
+            components = arguments["base_components"] or []
+            # Every component but the last one seen is complete
+            while components_written < len(components) - 1:
+                component = ComponentTemplate.model_validate(components[components_written])
+                schedule(self._component_files(components_path, component))
+                components_written += 1
+
+        template = MFETemplate.model_validate_json(raw)
+        remaining = self._layout_files(output_path, template.structure, template.config_files)
+        for component in template.base_components[components_written:]:
+            remaining.extend(self._component_files(components_path, component))
+        remaining.append((output_path / 'SETUP.md', '\n'.join(template.setup_instructions)))
+        schedule(remaining)
+
+        await asyncio.gather(*write_tasks)
         return template
 
     def _create_template_structure(self, base_path: Path, template: MFETemplate):
         """Create the physical template structure"""
-        # Create directories
-        for path, description in template.structure.items():
-            full_path = base_path / path
-            full_path.mkdir(parents=True, exist_ok=True)
-            (full_path / 'README.md').write_text(description)
-
-        # Create config files
-        for filename, content in template.config_files.items():
-            (base_path / filename).write_text(content)
+        writes = self._layout_files(base_path, template.structure, template.config_files)
 
-        # Create base components
+        # Base components
         components_path = base_path / 'src' / 'components'
-        components_path.mkdir(parents=True, exist_ok=True)
-        
         for component in template.base_components:
-            component_path = components_path / component.name
-            component_path.mkdir(exist_ok=True)
-            
-            # Write component files
-            (component_path / f'{component.name}.tsx').write_text(component.code)
-            if component.styles:
-                (component_path / f'{component.name}.styles.ts').write_text(component.styles)
-            (component_path / f'{component.name}.test.tsx').write_text(component.tests)
+            writes.extend(self._component_files(components_path, component))
+
+        # Setup instructions
+        writes.append((base_path / 'SETUP.md', '\n'.join(template.setup_instructions)))
 
-        # Write setup instructions
-        (base_path / 'SETUP.md').write_text('\n'.join(template.setup_instructions))
+        self._write_files(writes)
+
+    def _layout_files(
+        self,
+        base_path: Path,
+        structure: Dict[str, str],
+        config_files: Dict[str, str]
+    ) -> List[Tuple[Path, str]]:
+        """List the directory READMEs and config files of a template"""
+        writes = [(base_path / path / 'README.md', description) for path, description in structure.items()]
+        writes.extend((base_path / filename, content) for filename, content in config_files.items())
+        return writes
+
+    def _component_files(self, components_path: Path, component: ComponentTemplate) -> List[Tuple[Path, str]]:
+        """List the files written for one component"""
+        component_path = components_path / component.name
+        files = [(component_path / f'{component.name}.tsx', component.code)]
+        if component.styles:
+            files.append((component_path / f'{component.name}.styles.ts', component.styles))
+        files.append((component_path / f'{component.name}.test.tsx', component.tests))
+        return files
+
+    def _write_files(self, writes: List[Tuple[Path, str]]):
+        """Create every parent directory once, then write the files in parallel"""
+        for directory in sorted({path.parent for path, _ in writes}):
+            directory.mkdir(parents=True, exist_ok=True)
+        # Small writes are dominated by syscall latency, so overlap them
+        list(_write_executor().map(_write_text, writes))
 
     def generate_component_template(
         self,
@@ -136,18 +210,15 @@ class GenAITemplateGenerator:
     ) -> ComponentTemplate:
         """Generate a single component template"""
         
-        response = self.llm.predict_messages([
+        return self.component_llm.invoke([
             ("system", "Generate component template"),
             ("human", f"""
             Name: {name}
             Type: {component_type}
-            Features: {json.dumps(features)}
+            Features: {dumps_json(features)}
             """)
         ])
 
-        parser = PydanticOutputParser(pydantic_object=ComponentTemplate)
-        return parser.parse(response.content)
-
 if __name__ == "__main__":
     import argparse
     from dotenv import load_dotenv
@@ -166,8 +237,7 @@ if __name__ == "__main__":
     # Load testing config
     testing_requirements = {}
     if args.testing_config:
-        with open(args.testing_config) as f:
-            testing_requirements = json.load(f)
+        testing_requirements = load_json_file(args.testing_config)
 
     template = generator.generate_mfe_template(
         Path(args.output_path),
@@ -1,15 +1,24 @@
 from pathlib import Path
-import json
+import hashlib
+import heapq
 import re
 from typing import Dict, List, Set, Optional
 from dataclasses import dataclass
 from enum import Enum
 import ast
-from langchain.chat_models import ChatOpenAI
+from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
-from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 from test_analyzer import TestAnalyzer, TestLevel, ComponentCoverage, TestAnalysis
+from utils.http_client import shared_http_client
+from utils.llm_cache import enable_langchain_cache
+from utils.structured_output import with_validated_output
+from utils.serialization import dumps_json
+
+# Upper bound on in-flight OpenAI requests when batching per-component prompts
+MAX_CONCURRENT_REQUESTS = 8
+# Refactoring suggestions are only requested for this many top-ranked components
+DEFAULT_MAX_REFACTORING_CANDIDATES = 10
 
 class AITestSuggestion(BaseModel):
     test_description: str = Field(description="Description of the test to be created")
@@ -24,14 +33,30 @@ class AIRefactoringSuggestion(BaseModel):
     impact: str = Field(description="Impact on test coverage")
     implementation_approach: str = Field(description="How to implement the refactoring")
 
+def _refactoring_score(coverage: ComponentCoverage) -> int:
+    """Cheap ranking of how much a component would benefit from refactoring"""
+    return coverage.complexity + 2 * len(coverage.data_dependencies) + len(coverage.api_calls)
+
 class GenAITestAnalyzer(TestAnalyzer):
-    def __init__(self, mfe_paths: List[Path], automation_repo_path: Path, openai_api_key: str):
+    def __init__(
+        self,
+        mfe_paths: List[Path],
+        automation_repo_path: Path,
+        openai_api_key: str,
+        max_refactoring_candidates: int = DEFAULT_MAX_REFACTORING_CANDIDATES
+    ):
         super().__init__(mfe_paths, automation_repo_path)
+        self.max_refactoring_candidates = max_refactoring_candidates
         self.llm = ChatOpenAI(
             temperature=0.2,
             model="gpt-4",
-            openai_api_key=openai_api_key
+            openai_api_key=openai_api_key,
+            http_client=shared_http_client()
         )
+        # Schema-constrained variants so replies always parse into the models
+        self.test_suggestion_llm = with_validated_output(self.llm, AITestSuggestion)
+        self.refactoring_llm = with_validated_output(self.llm, AIRefactoringSuggestion)
+        enable_langchain_cache()
         self._setup_prompts()
 
     def _setup_prompts(self):
@@ -85,11 +110,25 @@ class GenAITestAnalyzer(TestAnalyzer):
         
         return ai_suggestions
 
+    def _batch_distinct(self, llm, batch_messages: List[List[tuple]]) -> list:
+        """Batch prompts through llm, sending each distinct prompt only once"""
+        keys = [hashlib.sha256(repr(messages).encode("utf-8")).digest() for messages in batch_messages]
+        distinct = dict(zip(keys, batch_messages))
+
+        responses = llm.batch(
+            list(distinct.values()),
+            config={"max_concurrency": MAX_CONCURRENT_REQUESTS},
+            return_exceptions=True
+        )
+        by_key = dict(zip(distinct, responses))
+        return [by_key[key] for key in keys]
+
     def _generate_ai_test_suggestions(self, base_analysis: TestAnalysis) -> List[AITestSuggestion]:
         """Generate AI-powered test suggestions"""
         suggestions = []
-        parser = PydanticOutputParser(pydantic_object=AITestSuggestion)
 
+        component_names = []
+        batch_messages = []
         for component_name, coverage in self.component_coverage.items():
             # Prepare component info
             component_info = {
@@ -107,64 +146,90 @@ class GenAITestAnalyzer(TestAnalyzer):
                 "e2e_tests": len(coverage.e2e_tests)
             }
 
-            # Get AI suggestion
-            response = self.llm.predict_messages([
+            component_names.append(component_name)
+            batch_messages.append([
                 ("system", "Suggest a test based on the component analysis."),
-                ("human", f"Component: {json.dumps(component_info)}\nCoverage: {json.dumps(existing_coverage)}")
+                ("human", f"Component: {dumps_json(component_info)}\nCoverage: {dumps_json(existing_coverage)}")
             ])
 
-            try:
-                suggestion = parser.parse(response.content)
-                suggestions.append(suggestion)
-            except Exception as e:
-                print(f"Error parsing suggestion for {component_name}: {e}")
+        # Get AI suggestions for all components concurrently
+        responses = self._batch_distinct(self.test_suggestion_llm, batch_messages)
+
+        for component_name, response in zip(component_names, responses):
+            if isinstance(response, Exception):
+                print(f"Error generating suggestion for {component_name}: {response}")
+            else:
+                suggestions.append(response)
 
         return suggestions
 
     def _generate_ai_refactoring_suggestions(self, base_analysis: TestAnalysis) -> List[AIRefactoringSuggestion]:
         """Generate AI-powered refactoring suggestions"""
         suggestions = []
-        parser = PydanticOutputParser(pydantic_object=AIRefactoringSuggestion)
 
-        for component_name, coverage in self.component_coverage.items():
-            if coverage.complexity > 5 or len(coverage.data_dependencies) > 3:
-                # Prepare analysis
-                component_analysis = {
-                    "name": component_name,
-                    "complexity": coverage.complexity,
-                    "dependencies": coverage.data_dependencies,
-                    "api_calls": coverage.api_calls
-                }
-
-                testing_issues = [
-                    issue for issue in base_analysis.missing_coverage 
-                    if component_name in issue
-                ]
-
-                # Get AI suggestion
-                response = self.llm.predict_messages([
-                    ("system", "Suggest refactoring to improve testability."),
-                    ("human", f"Component: {json.dumps(component_analysis)}\nIssues: {json.dumps(testing_issues)}")
-                ])
-
-                try:
-                    suggestion = parser.parse(response.content)
-                    suggestions.append(suggestion)
-                except Exception as e:
-                    print(f"Error parsing refactoring suggestion for {component_name}: {e}")
+        component_names = []
+        batch_messages = []
+        # Only the highest scoring candidates are worth a GPT-4 call
+        candidates = [
+            (component_name, coverage)
+            for component_name, coverage in self.component_coverage.items()
+            if coverage.complexity > 5 or len(coverage.data_dependencies) > 3
+        ]
+        candidates = heapq.nlargest(
+            self.max_refactoring_candidates,
+            candidates,
+            key=lambda candidate: _refactoring_score(candidate[1])
+        )
+
+        for component_name, coverage in candidates:
+            # Prepare analysis
+            component_analysis = {
+                "name": component_name,
+                "complexity": coverage.complexity,
+                "dependencies": coverage.data_dependencies,
+                "api_calls": coverage.api_calls
+            }
+
+            testing_issues = [
+                issue for issue in base_analysis.missing_coverage 
+                if component_name in issue
+            ]
+
+            component_names.append(component_name)
+            batch_messages.append([
+                ("system", "Suggest refactoring to improve testability."),
+                ("human", f"Component: {dumps_json(component_analysis)}\nIssues: {dumps_json(testing_issues)}")
+            ])
+
+        # Get AI suggestions for all candidates concurrently
+        responses = self._batch_distinct(self.refactoring_llm, batch_messages)
+
+        for component_name, response in zip(component_names, responses):
+            if isinstance(response, Exception):
+                print(f"Error generating refactoring suggestion for {component_name}: {response}")
+            else:
+                suggestions.append(response)
 
         return suggestions
 
     def _generate_test_strategy(self) -> str:
         """Generate overall test strategy recommendations"""
-        # Prepare summary of current state
+        # Prepare summary of current state, tallied in a single pass
+        unit_tests = integration_tests = e2e_tests = complex_components = api_dependent = 0
+        for coverage in self.component_coverage.values():
+            unit_tests += len(coverage.unit_tests)
+            integration_tests += len(coverage.integration_tests)
+            e2e_tests += len(coverage.e2e_tests)
+            complex_components += coverage.complexity > 5
+            api_dependent += bool(coverage.api_calls)
+
         summary = {
             "components": len(self.component_coverage),
-            "total_unit_tests": sum(len(c.unit_tests) for c in self.component_coverage.values()),
-            "total_integration_tests": sum(len(c.integration_tests) for c in self.component_coverage.values()),
-            "total_e2e_tests": sum(len(c.e2e_tests) for c in self.component_coverage.values()),
-            "complex_components": sum(1 for c in self.component_coverage.values() if c.complexity > 5),
-            "api_dependent_components": sum(1 for c in self.component_coverage.values() if c.api_calls)
+            "total_unit_tests": unit_tests,
+            "total_integration_tests": integration_tests,
+            "total_e2e_tests": e2e_tests,
+            "complex_components": complex_components,
+            "api_dependent_components": api_dependent
         }
 
         # Get AI recommendation
@@ -176,7 +241,7 @@ class GenAITestAnalyzer(TestAnalyzer):
             3. Priority areas
             4. Implementation approach
             5. Timeline and phases"""),
-            ("human", f"Current Test State: {json.dumps(summary)}")
+            ("human", f"Current Test State: {dumps_json(summary)}")
         ])
 
         return response.content
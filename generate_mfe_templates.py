@@ -1,10 +1,28 @@
 from pathlib import Path
 import ast
-import json
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import yaml
+from fnmatch import fnmatch
+
+from utils.cache_dir import tree_cache_dir
+from utils.file_cache import load_pickle, store_pickle
+from utils.fs_walk import PARALLEL_MIN_FILES, walk_files
+from utils.serialization import dumps_json
+from utils.tsx_parser import parse_component, tsx_parser_available
+
+# Patterns run against every .tsx file, compiled once
+COMPONENT_NAME_PATTERN = re.compile(r"export\s+(?:default\s+)?(?:const|function|class)\s+(\w+)")
+PROPS_INTERFACE_PATTERN = re.compile(r"interface\s+\w+Props\s*\{([^}]+)\}")
+TEST_ID_PATTERN = re.compile(r'data-testid=["\']([^"\']+)["\']')
+# useState and useSelector hooks in one alternation so state is found in a single scan
+STATE_HOOK_PATTERN = re.compile(
+    r"const\s+\[(?P<state_name>\w+),\s*set\w+\]\s*=\s*useState[<\w+>]*\((?P<state_default>.*)\)"
+    r"|useSelector\(\s*(?:state\s*=>\s*)?state\.(?P<slice>\w+)\.(?P<field>\w+)"
+)
 
 @dataclass
 class ComponentInfo:
@@ -17,12 +35,129 @@ class ComponentInfo:
     events: Dict[str, dict]
     api_endpoints: Dict[str, dict]
 
+# File name patterns each analyzer reads; a file may match more than one
+SOURCE_FILE_PATTERNS = {
+    "components": "*.tsx",
+    "store": "*store*.ts",
+    "api": "*api*.ts",
+}
+
+# Per-file extraction results are kept between runs, keyed by mtime and size,
+# in the tool's cache directory for the MFE tree
+ANALYSIS_CACHE_FILE = "mfe_analysis.pkl"
+# Bump when extraction output changes so old caches are ignored
+ANALYSIS_CACHE_VERSION = 2
+
+
+def extract_component_name(content: str) -> Optional[str]:
+    match = COMPONENT_NAME_PATTERN.search(content)
+    return match.group(1) if match else None
+
+def extract_props(content: str) -> List[str]:
+    match = PROPS_INTERFACE_PATTERN.search(content)
+    if not match:
+        return []
+    props_content = match.group(1)
+    return [prop.strip().split(':')[0].strip() for prop in props_content.split(';') if prop.strip()]
+
+def extract_test_id(content: str) -> Optional[str]:
+    match = TEST_ID_PATTERN.search(content)
+    return match.group(1) if match else None
+
+def extract_state_usage(content: str) -> Dict[str, dict]:
+    state = {}
+    for match in STATE_HOOK_PATTERN.finditer(content):
+        if match.group("state_name"):
+            # useState hook
+            state[match.group("state_name")] = {
+                "type": "local",
+                "default": match.group("state_default")
+            }
+        else:
+            # useSelector hook
+            key = f"{match.group('slice')}.{match.group('field')}"
+            state[key] = {
+                "type": "redux",
+                "selector": f"state.{key}"
+            }
+    return state
+
+def extract_component(
+    tsx_file: Path,
+    mfe_root: Path,
+    content: Optional[str] = None
+) -> Optional[Tuple[ComponentInfo, List[str]]]:
+    """
+    Extract a component and the names of the components it renders
+
+    Module level so ProcessPoolExecutor workers can run it. Children are
+    returned by name and linked to their ComponentInfo by the caller.
+    """
+    if content is None:
+        with open(tsx_file) as f:
+            content = f.read()
+
+    path = str(tsx_file.relative_to(mfe_root))
+    if tsx_parser_available():
+        parsed = parse_component(content)
+        if parsed is None:
+            return None
+        info = ComponentInfo(
+            name=parsed.name,
+            path=path,
+            props=parsed.props,
+            state=parsed.state,
+            test_id=parsed.test_id,
+            children={},
+            events=parsed.events,
+            api_endpoints=parsed.api_endpoints
+        )
+        return info, parsed.child_names
+
+    # Regex fallback when tree_sitter_languages isn't installed; there are
+    # no regex extractors for children, events or API usage
+    component_name = extract_component_name(content)
+    if not component_name:
+        return None
+
+    info = ComponentInfo(
+        name=component_name,
+        path=path,
+        props=extract_props(content),
+        state=extract_state_usage(content),
+        test_id=extract_test_id(content),
+        children={},
+        events={},
+        api_endpoints={}
+    )
+    return info, []
+
 class MFETemplateGenerator:
     def __init__(self, mfe_root: Path):
         self.mfe_root = Path(mfe_root)
         self.components: Dict[str, ComponentInfo] = {}
         self.redux_store: Dict[str, dict] = {}
         self.api_endpoints: Dict[str, dict] = {}
+        self._source_files: Optional[Dict[str, List[Path]]] = None
+        self._file_contents: Dict[Path, str] = {}
+
+    def _find_source_files(self, kind: str) -> List[Path]:
+        """Source files of one SOURCE_FILE_PATTERNS kind, classified during a single walk"""
+        if self._source_files is None:
+            self._source_files = {name: [] for name in SOURCE_FILE_PATTERNS}
+            for path in walk_files(self.mfe_root, (".ts", ".tsx")):
+                for name, pattern in SOURCE_FILE_PATTERNS.items():
+                    if fnmatch(path.name, pattern):
+                        self._source_files[name].append(path)
+        return self._source_files[kind]
+
+    def _read_source(self, path: Path) -> str:
+        """Read a source file once even if several analyzers match it"""
+        content = self._file_contents.get(path)
+        if content is None:
+            with open(path) as f:
+                content = self._file_contents[path] = f.read()
+        return content
 
     def analyze_mfe(self):
         """Analyze the MFE codebase and extract component information"""
@@ -35,55 +170,75 @@ class MFETemplateGenerator:
 
     def _analyze_components(self):
         """Extract component information from React components"""
-        for tsx_file in self.mfe_root.rglob("*.tsx"):
-            if "node_modules" in str(tsx_file):
+        tsx_files = self._find_source_files("components")
+        cached = self._load_analysis_cache()
+        entries: Dict[str, tuple] = {}
+        stale: List[Path] = []
+        for tsx_file in tsx_files:
+            stat = tsx_file.stat()
+            key = str(tsx_file.relative_to(self.mfe_root))
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            entry = cached.get(key)
+            if entry is not None and entry[0] == stamp:
+                entries[key] = entry
+            else:
+                entries[key] = (stamp, None)
+                stale.append(tsx_file)
+
+        # Only new or changed files are parsed again
+        if len(stale) > PARALLEL_MIN_FILES:
+            # Extraction is pure CPU work, so spread it across cores
+            with ProcessPoolExecutor() as executor:
+                extracted = list(executor.map(
+                    extract_component, stale, repeat(self.mfe_root), chunksize=32
+                ))
+        else:
+            extracted = [
+                extract_component(tsx_file, self.mfe_root, self._read_source(tsx_file))
+                for tsx_file in stale
+            ]
+        for tsx_file, result in zip(stale, extracted):
+            key = str(tsx_file.relative_to(self.mfe_root))
+            entries[key] = (entries[key][0], result)
+
+        # Saved before children are linked so each entry pickles on its own
+        self._save_analysis_cache(entries)
+        results = [result for _, result in entries.values()]
+
+        child_names: Dict[str, List[str]] = {}
+        for result in results:
+            if result is None:
                 continue
+            info, children = result
+            self.components[info.name] = info
+            child_names[info.name] = children
+
+        # Children can only be linked once every file has been analyzed
+        for name, children in child_names.items():
+            self.components[name].children.update({
+                child: self.components[child]
+                for child in children
+                if child != name and child in self.components
+            })
 
-            with open(tsx_file) as f:
-                content = f.read()
-
-            # Extract component name
-            component_name = self._extract_component_name(content)
-            if not component_name:
-                continue
-
-            # Extract props
-            props = self._extract_props(content)
-
-            # Extract test IDs
-            test_id = self._extract_test_id(content)
-
-            # Extract state usage
-            state = self._extract_state_usage(content)
-
-            # Extract children components
-            children = self._extract_children(content)
+    def _analysis_cache_path(self) -> Path:
+        return tree_cache_dir(self.mfe_root) / ANALYSIS_CACHE_FILE
 
-            # Extract event handlers
-            events = self._extract_events(content)
+    def _analysis_cache_key(self) -> tuple:
+        # Results from the tree-sitter and regex extractors differ slightly
+        return (ANALYSIS_CACHE_VERSION, tsx_parser_available())
 
-            # Extract API endpoints
-            api_endpoints = self._extract_api_usage(content)
+    def _load_analysis_cache(self) -> Dict[str, tuple]:
+        """Per-file extraction results from the last run, keyed by relative path"""
+        return load_pickle(self._analysis_cache_path(), self._analysis_cache_key(), {})
 
-            self.components[component_name] = ComponentInfo(
-                name=component_name,
-                path=str(tsx_file.relative_to(self.mfe_root)),
-                props=props,
-                state=state,
-                test_id=test_id,
-                children=children,
-                events=events,
-                api_endpoints=api_endpoints
-            )
+    def _save_analysis_cache(self, entries: Dict[str, tuple]):
+        store_pickle(self._analysis_cache_path(), self._analysis_cache_key(), entries)
 
     def _analyze_redux_store(self):
         """Analyze Redux store structure"""
-        for ts_file in self.mfe_root.rglob("*store*.ts"):
-            if "node_modules" in str(ts_file):
-                continue
-
-            with open(ts_file) as f:
-                content = f.read()
+        for ts_file in self._find_source_files("store"):
+            content = self._read_source(ts_file)
 
             # Extract reducers
             reducers = self._extract_reducers(content)
@@ -100,12 +255,8 @@ class MFETemplateGenerator:
 
     def _analyze_api_endpoints(self):
         """Analyze API endpoint definitions"""
-        for ts_file in self.mfe_root.rglob("*api*.ts"):
-            if "node_modules" in str(ts_file):
-                continue
-
-            with open(ts_file) as f:
-                content = f.read()
+        for ts_file in self._find_source_files("api"):
+            content = self._read_source(ts_file)
 
             endpoints = self._extract_endpoints(content)
             self.api_endpoints.update(endpoints)
@@ -118,13 +269,14 @@ class MFETemplateGenerator:
 
     def _generate_component_context(self):
         """Generate MFE Component Context template"""
+        root = next(iter(self.components.values()))
         template = {
-            "componentName": self.components[list(self.components.keys())[0]].name,
+            "componentName": root.name,
             "type": "container",
-            "path": self.components[list(self.components.keys())[0]].path,
-            "testId": self.components[list(self.components.keys())[0]].test_id,
+            "path": root.path,
+            "testId": root.test_id,
             "children": self._format_children(self.components),
-            "store": self._format_store(),
+            "store": self._format_store(root),
             "userInteractions": self._format_events(),
             "endpoints": self._format_endpoints()
         }
@@ -132,13 +284,14 @@ class MFETemplateGenerator:
         with open(self.mfe_root / "data" / "manual_tests" / "mfe_component_context.md", "w") as f:
             f.write("# MFE Component Context Template\n\n")
             f.write("## Component Structure\n```json\n")
-            json.dump(template, f, indent=4)
+            f.write(dumps_json(template, indent=True))
             f.write("\n```\n")
 
     def _generate_test_mapping(self):
         """Generate React Component Test Mapping template"""
+        root = next(iter(self.components.values()))
         mapping = {
-            self.components[list(self.components.keys())[0]].name: {
+            root.name: {
                 "testScenarios": self._generate_test_scenarios(),
                 "stateMapping": self._generate_state_mapping(),
                 "eventSequences": self._generate_event_sequences()
@@ -148,7 +301,7 @@ class MFETemplateGenerator:
         with open(self.mfe_root / "data" / "manual_tests" / "react_component_test_mapping.md", "w") as f:
             f.write("# React Component Test Mapping\n\n")
             f.write("## Component to Test Mapping\n```json\n")
-            json.dump(mapping, f, indent=4)
+            f.write(dumps_json(mapping, indent=True))
             f.write("\n```\n")
 
     def _generate_framework_integration(self):
@@ -180,64 +333,57 @@ class MFETemplateGenerator:
         with open(self.mfe_root / "data" / "manual_tests" / "mfe_framework_integration.md", "w") as f:
             f.write("# MFE Framework Integration\n\n")
             f.write("## Framework Configuration\n```json\n")
-            json.dump(integration, f, indent=4)
+            f.write(dumps_json(integration, indent=True))
             f.write("\n```\n")
 
-    # Helper methods for extraction
-    def _extract_component_name(self, content: str) -> Optional[str]:
-        pattern = r"export\s+(?:default\s+)?(?:const|function|class)\s+(\w+)"
-        match = re.search(pattern, content)
-        return match.group(1) if match else None
-
-    def _extract_props(self, content: str) -> List[str]:
-        pattern = r"interface\s+\w+Props\s*\{([^}]+)\}"
-        match = re.search(pattern, content)
-        if not match:
-            return []
-        props_content = match.group(1)
-        return [prop.strip().split(':')[0].strip() for prop in props_content.split(';') if prop.strip()]
-
-    def _extract_test_id(self, content: str) -> Optional[str]:
-        pattern = r'data-testid=["\']([^"\']+)["\']'
-        match = re.search(pattern, content)
-        return match.group(1) if match else None
-
-    def _extract_state_usage(self, content: str) -> Dict[str, dict]:
-        state = {}
-        # Extract useState hooks
-        use_state_pattern = r"const\s+\[(\w+),\s*set\w+\]\s*=\s*useState[<\w+>]*\((.*)\)"
-        for match in re.finditer(use_state_pattern, content):
-            state[match.group(1)] = {
-                "type": "local",
-                "default": match.group(2)
-            }
-        # Extract useSelector hooks
-        use_selector_pattern = r"useSelector\(\s*(?:state\s*=>\s*)?state\.(\w+)\.(\w+)"
-        for match in re.finditer(use_selector_pattern, content):
-            state[f"{match.group(1)}.{match.group(2)}"] = {
-                "type": "redux",
-                "selector": f"state.{match.group(1)}.{match.group(2)}"
-            }
-        return state
-
     def _format_children(self, components: Dict[str, ComponentInfo]) -> Dict[str, dict]:
-        children = {}
-        for name, info in components.items():
-            if info.children:
-                children[name] = {
+        """
+        Format the component tree, building each component's entry only once
+
+        Components rendered by several parents share one formatted entry. A
+        child that renders one of its own ancestors is left out so the tree
+        stays acyclic.
+        """
+        formatted: Dict[str, dict] = {}
+        for root in components.values():
+            if root.name in formatted:
+                continue
+            # Iterative post-order walk: children are formatted before parents
+            stack = [(root, iter(root.children.values()))]
+            on_path = {root.name}
+            while stack:
+                info, pending = stack[-1]
+                child = next(pending, None)
+                if child is not None:
+                    if child.name not in formatted and child.name not in on_path:
+                        on_path.add(child.name)
+                        stack.append((child, iter(child.children.values())))
+                    continue
+
+                stack.pop()
+                on_path.discard(info.name)
+                formatted[info.name] = {
                     "type": "component",
                     "testId": info.test_id,
                     "props": info.props,
-                    "children": self._format_children(info.children)
+                    "children": {
+                        name: formatted[name]
+                        for name, child_info in info.children.items()
+                        if child_info.children and name in formatted
+                    }
                 }
-        return children
 
-    def _format_store(self) -> Dict[str, dict]:
+        return {
+            name: formatted[name]
+            for name, info in components.items()
+            if info.children
+        }
+
+    def _format_store(self, root: ComponentInfo) -> Dict[str, dict]:
         return {
             "store": self.redux_store,
             "local": {
-                name: info for name, info in 
-                next(iter(self.components.values())).state.items() 
+                name: info for name, info in root.state.items()
                 if info["type"] == "local"
             }
         }
@@ -9,13 +9,14 @@ class IntegratedMFEGenerator:
         self.analyzer = ExistingTemplateAnalyzer(mfe_root)
         self.generator = GenAITemplateGenerator(openai_api_key)
         self.mfe_root = mfe_root
+        self.features: List[str] = []
 
     def generate_integrated_template(self, output_path: Path, framework: TemplateType):
         # First analyze existing MFE
         self.analyzer.analyze_mfe()
         
-        # Extract features from analysis
-        features = self._extract_features_from_analysis()
+        # Extract features from analysis, kept for reporting
+        self.features = features = self._extract_features_from_analysis()
         
         # Extract testing requirements
         testing_requirements = self._extract_testing_requirements()
@@ -47,7 +48,9 @@ class IntegratedMFEGenerator:
             if component.test_id:
                 features.append("testable-components")
         
-        return list(set(features))  # Remove duplicates
+        # Remove duplicates, keeping a stable order so the prompt (and its
+        # cache key) doesn't change between runs
+        return list(dict.fromkeys(features))
 
     def _extract_testing_requirements(self) -> Dict[str, any]:
         """Extract testing requirements from existing MFE"""
@@ -65,6 +68,7 @@ class IntegratedMFEGenerator:
 
 if __name__ == "__main__":
     import argparse
+    import os
     from dotenv import load_dotenv
     
     load_dotenv()
@@ -89,5 +93,5 @@ if __name__ == "__main__":
     print("\n=== Integrated MFE Template Generated ===")
     print(f"\nOutput Path: {args.output_path}")
     print("\nFeatures detected and included:")
-    for feature in generator._extract_features_from_analysis():
+    for feature in generator.features:
         print(f"- {feature}") 
\ No newline at end of file
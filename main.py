@@ -1,11 +1,20 @@
 from pathlib import Path
 import argparse
 import os
+import re
 from config import load_framework_config
-from utils.framework_analyzer import FrameworkAnalyzer
-from chains.convert_manual_to_script import generate_feature_and_steps, load_manual_test
-from utils.file_writer import write_test_components
-from generate_mfe_templates import MFETemplateGenerator
+from utils.cache_dir import tree_cache_dir
+from utils.file_cache import load_pickle, store_pickle
+from utils.framework_analyzer import ANALYSIS_CACHE_VERSION, FrameworkAnalyzer
+from utils.fs_walk import fingerprint_files
+from utils.ts_parser import ts_parser_available
+
+FEATURE_HEADER_PATTERN = re.compile(rb"Feature:([^\r\n]*)")
+FEATURE_HEADER_SCAN_BYTES = 4096
+
+# Framework analysis of the last run, reused while the files it read are
+# unchanged; kept in the tool's cache directory for the framework tree
+FRAMEWORK_ANALYSIS_CACHE = "framework_analysis.pkl"
 
 
 def get_repo_root() -> Path:
@@ -20,14 +29,22 @@ def get_repo_root() -> Path:
 
 
 def analyze_framework(framework_path: str | Path):
-    """Analyze the existing framework structure"""
-    config = load_framework_config(framework_path)
-    analyzer = FrameworkAnalyzer(config)
+    """Analyze the existing framework structure, reusing the last result if no input file changed"""
+    framework_path = Path(framework_path)
+    cache_path = tree_cache_dir(framework_path) / FRAMEWORK_ANALYSIS_CACHE
+    analyzer = FrameworkAnalyzer(load_framework_config(framework_path))
+    # Results from the tree-sitter and regex page object scanners differ slightly
+    cache_key = (ANALYSIS_CACHE_VERSION, ts_parser_available(), fingerprint_files(analyzer.input_paths()))
+    analysis = load_pickle(cache_path, cache_key)
+    if analysis is not None:
+        return analysis
+
     analysis = analyzer.analyze_framework()
+    store_pickle(cache_path, cache_key, analysis)
     return analysis
 
 
-def setup_required_folders():
+def setup_required_folders(framework_path: Path):
     """Ensure required folders exist"""
     folders = [
         "data/manual_tests",
@@ -37,15 +54,22 @@ def setup_required_folders():
         "outputs"
     ]
     for folder in folders:
-        Path(folder).mkdir(parents=True, exist_ok=True)
+        (framework_path / folder).mkdir(parents=True, exist_ok=True)
 
 
 def extract_feature_name(manual_test_path: str) -> str:
     """Extract feature name from manual test file"""
-    content = Path(manual_test_path).read_text()
-    if "Feature:" in content:
-        feature_line = [line for line in content.split('\n') if "Feature:" in line][0]
-        return feature_line.split("Feature:")[1].strip().lower().replace(" ", "_")
+    with open(manual_test_path, "rb") as f:
+        # The Feature: header is almost always within the first few KB
+        head = f.read(FEATURE_HEADER_SCAN_BYTES)
+        match = FEATURE_HEADER_PATTERN.search(head)
+        # A header cut off at the end of the prefix can't be trusted
+        if (match is None or match.end() == len(head)) and len(head) == FEATURE_HEADER_SCAN_BYTES:
+            head += f.read()
+            match = FEATURE_HEADER_PATTERN.search(head)
+    if match:
+        feature_name = match.group(1).decode("utf-8", errors="replace")
+        return feature_name.strip().lower().replace(" ", "_")
     return Path(manual_test_path).stem
 
 
@@ -59,18 +83,22 @@ def validate_paths(framework_path: Path, manual_test_path: Path):
     if not manual_test_path.exists():
         raise FileNotFoundError(f"Manual test file does not exist: {manual_test_path}")
     
-    # Check prompts directory
-    prompts_dir = Path("prompts")
+    # Check prompts directory with a single listing instead of a stat per prompt
+    prompts_dir = framework_path / "prompts"
     required_prompts = [
         "feature_file_prompt.md",
         "step_definition_prompt.md",
         "test_generation_prompt.md"
     ]
-    
-    for prompt in required_prompts:
-        prompt_path = prompts_dir / prompt
-        if not prompt_path.exists():
-            raise FileNotFoundError(f"Required prompt file not found: {prompt_path}")
+    try:
+        with os.scandir(prompts_dir) as entries:
+            present = {entry.name for entry in entries}
+    except FileNotFoundError:
+        present = set()
+
+    missing = [str(prompts_dir / prompt) for prompt in required_prompts if prompt not in present]
+    if missing:
+        raise FileNotFoundError(f"Required prompt files not found: {', '.join(missing)}")
 
 
 def main(framework_path: str | None, manual_test_path: str, mfe_path: str = None):
@@ -86,11 +114,8 @@ def main(framework_path: str | None, manual_test_path: str, mfe_path: str = None
         if mfe_path:
             mfe_path = Path(mfe_path).resolve()
 
-        # Ensure we're in the framework directory
-        os.chdir(framework_path)
-        
         # Ensure required folders exist
-        setup_required_folders()
+        setup_required_folders(framework_path)
         
         # Validate all required paths and files
         validate_paths(framework_path, manual_test_path)
@@ -98,6 +123,7 @@ def main(framework_path: str | None, manual_test_path: str, mfe_path: str = None
         # Generate MFE templates if MFE path is provided
         if mfe_path:
             try:
+                from generate_mfe_templates import MFETemplateGenerator
                 generator = MFETemplateGenerator(mfe_path)
                 generator.analyze_mfe()
                 generator.generate_templates()
@@ -108,11 +134,16 @@ def main(framework_path: str | None, manual_test_path: str, mfe_path: str = None
         
         # Analyze framework structure
         framework_analysis = analyze_framework(framework_path)
+
+        # LangChain and the Vertex AI client are only loaded once generation starts
+        from chains.convert_manual_to_script import generate_feature_and_steps
+        from utils.file_writer import write_test_components
         
         # Generate test components
         components = generate_feature_and_steps(
             manual_test_path,
-            framework_analysis=framework_analysis
+            framework_analysis=framework_analysis,
+            base_dir=framework_path
         )
         
         # Extract feature name
@@ -1,10 +1,35 @@
 from pathlib import Path
 import json
 import re
-from typing import Dict, List, Set, Optional
+from typing import Dict, List, Set, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import ast
+from functools import lru_cache
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - pyahocorasick is optional
+    ahocorasick = None
+
+from utils.fs_walk import walk_files
+from utils.source_bytes import source_bytes
+
+# Patterns run against every component file, compiled once. They match raw
+# bytes so large files can be scanned through mmap; only captures are decoded.
+COMPONENT_NAME_PATTERN = re.compile(rb"export\s+(?:default\s+)?(?:const|function|class)\s+(\w+)")
+# Control structures, hooks and functions each add one point of complexity
+COMPLEXITY_PATTERN = re.compile(
+    rb"\b(?:if|else|for|while|switch|case|useState|useEffect|useCallback|useMemo|function)\b"
+)
+SELECTOR_PATTERN = re.compile(rb"useSelector\(\s*(?:state\s*=>\s*)?state\.(\w+)")
+USE_STATE_PATTERN = re.compile(rb"const\s+\[(\w+),")
+API_CALL_PATTERN = re.compile(rb"(?:fetch|axios\.get|axios\.post|axios\.put|axios\.delete)\(['\"]([^'\"]+)")
+EVENT_HANDLER_PATTERN = re.compile(rb"on(?:Click|Change|Submit|Input|Focus|Blur|KeyPress|MouseOver)=")
+
+# Feature file lines, matched with surrounding whitespace already stripped
+SCENARIO_PATTERN = re.compile(r"^[ \t]*Scenario:[ \t]*(.*?)[ \t\r]*$", re.M)
+STEP_PATTERN = re.compile(r"^[ \t]*((?:Given|When|Then|And).*?)[ \t\r]*$", re.M)
 
 class TestLevel(Enum):
     UNIT = "unit"
@@ -29,11 +54,30 @@ class TestAnalysis:
     refactoring_suggestions: List[str]
     pyramid_violations: List[str]
 
+def _decode(captured: bytes) -> str:
+    return captured.decode("utf-8", errors="replace")
+
+@lru_cache(maxsize=None)
+def _test_level_for(interactions: int, has_api_calls: bool, complexity: int, dependencies: int) -> TestLevel:
+    """Test level for a component signature; many components share a signature"""
+    # Components with high user interaction and API calls should have E2E tests
+    if interactions > 3 and has_api_calls:
+        return TestLevel.E2E
+    
+    # Complex components with data dependencies should have integration tests
+    if complexity > 5 or dependencies > 2:
+        return TestLevel.INTEGRATION
+    
+    # Simple, pure components should have unit tests
+    return TestLevel.UNIT
+
 class TestAnalyzer:
     def __init__(self, mfe_paths: List[Path], automation_repo_path: Path):
         self.mfe_paths = [Path(p) for p in mfe_paths]
         self.automation_path = Path(automation_repo_path)
         self.component_coverage: Dict[str, ComponentCoverage] = {}
+        self._component_automaton = None
+        self._component_names_lower: List[Tuple[str, str]] = []
         self.test_pyramid_ratios = {
             TestLevel.UNIT: 0.70,  # 70% unit tests
             TestLevel.INTEGRATION: 0.20,  # 20% integration tests
@@ -54,47 +98,49 @@ class TestAnalyzer:
     def _analyze_mfe_components(self):
         """Analyze React components and their unit tests"""
         for mfe_path in self.mfe_paths:
-            for tsx_file in mfe_path.rglob("*.tsx"):
-                if "node_modules" in str(tsx_file):
-                    continue
-
-                component_name = self._extract_component_name(tsx_file)
-                if not component_name:
-                    continue
-
-                # Find corresponding test file
-                test_file = self._find_test_file(tsx_file)
+            for tsx_file in walk_files(mfe_path, (".tsx",)):
+                # Read once; every extractor below scans the same bytes
+                with source_bytes(tsx_file) as content:
+                    component_name = self._extract_component_name(content)
+                    if not component_name:
+                        continue
+
+                    # Find corresponding test file
+                    test_file = self._find_test_file(tsx_file)
                 
-                # Analyze component complexity
-                complexity = self._analyze_component_complexity(tsx_file)
+                    # Analyze component complexity
+                    complexity = self._analyze_component_complexity(content)
                 
-                # Analyze dependencies
-                dependencies = self._analyze_dependencies(tsx_file)
+                    # Analyze dependencies
+                    dependencies = self._analyze_dependencies(content)
                 
-                # Analyze API calls
-                api_calls = self._analyze_api_usage(tsx_file)
+                    # Analyze API calls
+                    api_calls = self._analyze_api_usage(content)
                 
-                # Analyze user interactions
-                interactions = self._analyze_user_interactions(tsx_file)
+                    # Analyze user interactions
+                    interactions = self._analyze_user_interactions(content)
                 
-                # Record coverage
-                self.component_coverage[component_name] = ComponentCoverage(
-                    name=component_name,
-                    unit_tests=self._extract_unit_tests(test_file) if test_file else [],
-                    integration_tests=[],  # Will be populated from automation repo
-                    e2e_tests=[],  # Will be populated from automation repo
-                    complexity=complexity,
-                    data_dependencies=dependencies,
-                    api_calls=api_calls,
-                    user_interactions=interactions
-                )
+                    # Record coverage
+                    self.component_coverage[component_name] = ComponentCoverage(
+                        name=component_name,
+                        unit_tests=self._extract_unit_tests(test_file) if test_file else [],
+                        integration_tests=[],  # Will be populated from automation repo
+                        e2e_tests=[],  # Will be populated from automation repo
+                        complexity=complexity,
+                        data_dependencies=dependencies,
+                        api_calls=api_calls,
+                        user_interactions=interactions
+                    )
 
     def _analyze_automation_tests(self):
         """Analyze Playwright tests from automation repo"""
-        # Analyze feature files
-        feature_files = list(self.automation_path.rglob("*.feature"))
+        self._component_automaton = self._build_component_automaton()
+        self._component_names_lower = [(name, name.lower()) for name in self.component_coverage]
         
-        for feature_file in feature_files:
+        # Analyze feature files as the walk finds them
+        for feature_file in walk_files(self.automation_path, (".feature",)):
+            # One path string per file, shared by every coverage entry it adds
+            feature_path = str(feature_file)
             scenarios = self._extract_scenarios(feature_file)
             for scenario in scenarios:
                 # Determine test type (integration or E2E)
@@ -107,9 +153,9 @@ class TestAnalyzer:
                 for component in components:
                     if component in self.component_coverage:
                         if test_type == TestLevel.INTEGRATION:
-                            self.component_coverage[component].integration_tests.append(str(feature_file))
+                            self.component_coverage[component].integration_tests.append(feature_path)
                         else:
-                            self.component_coverage[component].e2e_tests.append(str(feature_file))
+                            self.component_coverage[component].e2e_tests.append(feature_path)
 
     def _generate_analysis(self) -> TestAnalysis:
         """Generate test coverage analysis and suggestions"""
@@ -149,33 +195,32 @@ class TestAnalyzer:
 
     def _suggest_test_level(self, coverage: ComponentCoverage) -> TestLevel:
         """Suggest appropriate test level based on component characteristics"""
-        # Components with high user interaction and API calls should have E2E tests
-        if len(coverage.user_interactions) > 3 and coverage.api_calls:
-            return TestLevel.E2E
-        
-        # Complex components with data dependencies should have integration tests
-        if coverage.complexity > 5 or len(coverage.data_dependencies) > 2:
-            return TestLevel.INTEGRATION
-        
-        # Simple, pure components should have unit tests
-        return TestLevel.UNIT
+        return _test_level_for(
+            len(coverage.user_interactions),
+            bool(coverage.api_calls),
+            coverage.complexity,
+            len(coverage.data_dependencies)
+        )
 
     def _analyze_test_pyramid(self) -> List[str]:
         """Analyze if test distribution follows the pyramid model"""
         violations = []
         
-        total_tests = sum(
-            len(c.unit_tests) + len(c.integration_tests) + len(c.e2e_tests)
-            for c in self.component_coverage.values()
-        )
+        # Count every level in a single pass
+        unit_tests = integration_tests = e2e_tests = 0
+        for coverage in self.component_coverage.values():
+            unit_tests += len(coverage.unit_tests)
+            integration_tests += len(coverage.integration_tests)
+            e2e_tests += len(coverage.e2e_tests)
+        total_tests = unit_tests + integration_tests + e2e_tests
         
         if total_tests == 0:
             return ["No tests found"]
 
         # Calculate actual ratios
-        unit_ratio = sum(len(c.unit_tests) for c in self.component_coverage.values()) / total_tests
-        integration_ratio = sum(len(c.integration_tests) for c in self.component_coverage.values()) / total_tests
-        e2e_ratio = sum(len(c.e2e_tests) for c in self.component_coverage.values()) / total_tests
+        unit_ratio = unit_tests / total_tests
+        integration_ratio = integration_tests / total_tests
+        e2e_ratio = e2e_tests / total_tests
 
         # Check for violations
         if unit_ratio < self.test_pyramid_ratios[TestLevel.UNIT]:
@@ -186,44 +231,34 @@ class TestAnalyzer:
         return violations
 
     # Helper methods for extraction and analysis
-    def _extract_component_name(self, file_path: Path) -> Optional[str]:
-        """Extract React component name from file"""
-        pattern = r"export\s+(?:default\s+)?(?:const|function|class)\s+(\w+)"
-        content = file_path.read_text()
-        match = re.search(pattern, content)
-        return match.group(1) if match else None
-
-    def _analyze_component_complexity(self, file_path: Path) -> int:
+    def _extract_component_name(self, content: bytes) -> Optional[str]:
+        """Extract React component name from file content"""
+        match = COMPONENT_NAME_PATTERN.search(content)
+        return _decode(match.group(1)) if match else None
+
+    def _analyze_component_complexity(self, content: bytes) -> int:
         """Analyze component complexity based on various factors"""
-        content = file_path.read_text()
-        # Basic complexity metrics
-        complexity = 0
-        complexity += len(re.findall(r"if|else|for|while|switch|case", content))  # Control structures
-        complexity += len(re.findall(r"useState|useEffect|useCallback|useMemo", content))  # Hooks
-        complexity += len(re.findall(r"function", content))  # Functions
-        return complexity
-
-    def _analyze_dependencies(self, file_path: Path) -> List[str]:
+        # Control structures, hooks and functions counted in a single scan
+        return len(COMPLEXITY_PATTERN.findall(content))
+
+    def _analyze_dependencies(self, content: bytes) -> List[str]:
         """Analyze component data dependencies"""
-        content = file_path.read_text()
         dependencies = []
         # Find Redux selectors
-        dependencies.extend(re.findall(r"useSelector\(\s*(?:state\s*=>\s*)?state\.(\w+)", content))
+        dependencies.extend(map(_decode, SELECTOR_PATTERN.findall(content)))
         # Find useState hooks
-        dependencies.extend(re.findall(r"const\s+\[(\w+),", content))
+        dependencies.extend(map(_decode, USE_STATE_PATTERN.findall(content)))
         return dependencies
 
-    def _analyze_api_usage(self, file_path: Path) -> List[str]:
+    def _analyze_api_usage(self, content: bytes) -> List[str]:
         """Analyze API endpoints used by component"""
-        content = file_path.read_text()
         # Find fetch/axios calls
-        return re.findall(r"(?:fetch|axios\.get|axios\.post|axios\.put|axios\.delete)\(['\"]([^'\"]+)", content)
+        return [_decode(url) for url in API_CALL_PATTERN.findall(content)]
 
-    def _analyze_user_interactions(self, file_path: Path) -> List[str]:
+    def _analyze_user_interactions(self, content: bytes) -> List[str]:
         """Analyze user interaction points"""
-        content = file_path.read_text()
         # Find event handlers
-        return re.findall(r"on(?:Click|Change|Submit|Input|Focus|Blur|KeyPress|MouseOver)=", content)
+        return [_decode(handler) for handler in EVENT_HANDLER_PATTERN.findall(content)]
 
     def _find_test_file(self, component_file: Path) -> Optional[Path]:
         """Find corresponding test file for a component"""
@@ -237,38 +272,57 @@ class TestAnalyzer:
     def _extract_scenarios(self, feature_file: Path) -> List[dict]:
         """Extract scenarios from feature file"""
         content = feature_file.read_text()
+        headings = list(SCENARIO_PATTERN.finditer(content))
         scenarios = []
-        current_scenario = None
-        
-        for line in content.split('\n'):
-            if line.strip().startswith('Scenario:'):
-                if current_scenario:
-                    scenarios.append(current_scenario)
-                current_scenario = {'name': line.split('Scenario:')[1].strip(), 'steps': []}
-            elif current_scenario and line.strip().startswith(('Given', 'When', 'Then', 'And')):
-                current_scenario['steps'].append(line.strip())
-                
-        if current_scenario:
-            scenarios.append(current_scenario)
-            
+
+        for index, heading in enumerate(headings):
+            # A scenario's steps run until the next Scenario: line
+            end = headings[index + 1].start() if index + 1 < len(headings) else len(content)
+            steps = STEP_PATTERN.findall(content, heading.end(), end)
+            scenarios.append({
+                'name': heading.group(1),
+                'steps': steps,
+                # Shared by the test type and affected component lookups
+                'steps_lower': ' '.join(steps).lower()
+            })
+
         return scenarios
 
     def _determine_test_type(self, scenario: dict) -> TestLevel:
         """Determine if a scenario is integration or E2E test"""
         # Check for API calls or multiple component interactions
-        steps = ' '.join(scenario['steps']).lower()
+        steps = scenario['steps_lower']
         if 'api' in steps or 'request' in steps or 'response' in steps:
             return TestLevel.INTEGRATION
         return TestLevel.E2E
 
+    def _build_component_automaton(self):
+        """Index lowercase component names so each scenario is matched in one scan"""
+        if ahocorasick is None or not self.component_coverage:
+            return None
+        names: Dict[str, List[str]] = {}
+        for component in self.component_coverage:
+            names.setdefault(component.lower(), []).append(component)
+        automaton = ahocorasick.Automaton()
+        for name, components in names.items():
+            automaton.add_word(name, tuple(components))
+        automaton.make_automaton()
+        return automaton
+
     def _find_affected_components(self, scenario: dict) -> Set[str]:
         """Find components affected by a test scenario"""
         affected = set()
-        steps = ' '.join(scenario['steps']).lower()
-        
+        steps = scenario['steps_lower']
+
+        # Aho-Corasick reports every (overlapping) name occurrence, like the
+        # substring checks below, in a single pass over the steps
+        if self._component_automaton is not None:
+            for _, components in self._component_automaton.iter(steps):
+                affected.update(components)
+            return affected
+
         # Match steps with component names and interactions
-        for component in self.component_coverage.keys():
-            component_lower = component.lower()
+        for component, component_lower in self._component_names_lower:
             if component_lower in steps:
                 affected.add(component)
             
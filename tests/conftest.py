@@ -0,0 +1,11 @@
+import pytest
+
+from utils.cache_dir import CACHE_DIR_ENV
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_root(tmp_path, monkeypatch):
+    """Keep every cache a test writes inside its own temporary directory"""
+    cache_root = tmp_path / "cache"
+    monkeypatch.setenv(CACHE_DIR_ENV, str(cache_root))
+    return cache_root
@@ -0,0 +1,68 @@
+import os
+
+from utils.file_cache import cached_load, load_pickle, store_pickle
+
+
+def _touch_later(path, seconds=10):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def _counting_parser(calls):
+    def parse(path):
+        calls.append(path)
+        with open(path) as f:
+            return f.read()
+    return parse
+
+
+def test_cached_load_reuses_result_until_source_changes(tmp_path):
+    source = tmp_path / "input.txt"
+    source.write_text("first")
+    calls = []
+    parser = _counting_parser(calls)
+
+    assert cached_load(source, parser) == "first"
+    assert cached_load(source, parser) == "first"
+    assert len(calls) == 1
+
+    source.write_text("second")
+    _touch_later(source)
+    assert cached_load(source, parser) == "second"
+    assert len(calls) == 2
+
+
+def test_cached_load_keys_on_parser(tmp_path):
+    source = tmp_path / "input.txt"
+    source.write_text("content")
+
+    def upper(path):
+        with open(path) as f:
+            return f.read().upper()
+
+    assert cached_load(source, _counting_parser([])) == "content"
+    assert cached_load(source, upper) == "CONTENT"
+
+
+def test_cached_load_writes_nothing_next_to_source(tmp_path, isolated_cache_root):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    source = data_dir / "input.txt"
+    source.write_text("content")
+
+    cached_load(source, _counting_parser([]))
+
+    assert os.listdir(data_dir) == ["input.txt"]
+    assert any(isolated_cache_root.rglob("*.pkl"))
+
+
+def test_load_pickle_misses_on_other_key_or_corrupt_file(tmp_path):
+    cache_path = tmp_path / "nested" / "entry.pkl"
+    store_pickle(cache_path, "key", {"a": 1})
+
+    assert load_pickle(cache_path, "key") == {"a": 1}
+    assert load_pickle(cache_path, "other", {}) == {}
+
+    cache_path.write_bytes(b"not a pickle")
+    assert load_pickle(cache_path, "key") is None
+    assert load_pickle(tmp_path / "missing.pkl", "key") is None
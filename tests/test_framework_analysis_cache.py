@@ -0,0 +1,38 @@
+import main
+from utils.framework_analyzer import FrameworkAnalyzer
+
+
+def _framework(tmp_path):
+    pages = tmp_path / "framework" / "src" / "pages"
+    pages.mkdir(parents=True)
+    (pages / "LoginPage.ts").write_text(
+        "export class LoginPage extends BasePage {\n"
+        "  async submit() {}\n"
+        "}\n"
+    )
+    return tmp_path / "framework"
+
+
+def test_analysis_is_cached_outside_the_framework(tmp_path, monkeypatch):
+    framework = _framework(tmp_path)
+    before = sorted(path.relative_to(framework) for path in framework.rglob("*"))
+
+    analysis = main.analyze_framework(framework)
+
+    assert "LoginPage" in analysis.page_objects
+    assert sorted(path.relative_to(framework) for path in framework.rglob("*")) == before
+
+    def fail(self):
+        raise AssertionError("analysis should come from the cache")
+
+    monkeypatch.setattr(FrameworkAnalyzer, "analyze_framework", fail)
+    assert main.analyze_framework(framework).page_objects.keys() == analysis.page_objects.keys()
+
+
+def test_changed_input_file_reanalyzes(tmp_path):
+    framework = _framework(tmp_path)
+    main.analyze_framework(framework)
+
+    (framework / "src" / "pages" / "CartPage.ts").write_text("export class CartPage {}\n")
+
+    assert "CartPage" in main.analyze_framework(framework).page_objects
@@ -0,0 +1,76 @@
+import os
+
+from utils.fs_walk import SKIPPED_DIRS, VCS_AND_BUILD_DIRS, fingerprint_files, walk_files
+from utils.repo_loader import load_all_files
+
+
+def _touch(path, text="x"):
+    path.write_text(text)
+    return path
+
+
+def test_fingerprint_ignores_path_order(tmp_path):
+    a = _touch(tmp_path / "a.ts")
+    b = _touch(tmp_path / "b.ts")
+
+    assert fingerprint_files([a, b]) == fingerprint_files(iter([b, a]))
+
+
+def test_fingerprint_changes_with_size_and_mtime(tmp_path):
+    path = _touch(tmp_path / "a.ts")
+    before = fingerprint_files([path])
+
+    _touch(path, "xy")
+    assert fingerprint_files([path]) != before
+
+    resized = fingerprint_files([path])
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert fingerprint_files([path]) != resized
+
+
+def test_fingerprint_changes_when_a_file_is_added_or_missing(tmp_path):
+    a = _touch(tmp_path / "a.ts")
+    b = tmp_path / "b.ts"
+    missing = fingerprint_files([a, b])
+
+    assert fingerprint_files([a]) != missing
+    _touch(b)
+    assert fingerprint_files([a, b]) != missing
+
+
+def _tree(tmp_path):
+    for name in ("src/app.ts", "src/view.tsx", "README.md", "node_modules/lib/index.ts",
+                 "dist/app.ts", "build/app.ts", ".git/hooks/pre-commit.ts"):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _touch(path)
+    return tmp_path
+
+
+def _walked(root, *args):
+    return sorted(path.relative_to(root).as_posix() for path in walk_files(root, *args))
+
+
+def test_walk_skips_only_node_modules_by_default(tmp_path):
+    root = _tree(tmp_path)
+
+    assert _walked(root, (".ts",)) == [".git/hooks/pre-commit.ts", "build/app.ts", "dist/app.ts", "src/app.ts"]
+
+
+def test_walk_opts_in_to_skipping_vcs_and_build_dirs(tmp_path):
+    root = _tree(tmp_path)
+
+    assert _walked(root, (".ts", ".tsx"), SKIPPED_DIRS | VCS_AND_BUILD_DIRS) == ["src/app.ts", "src/view.tsx"]
+
+
+def test_walk_without_suffixes_yields_every_file(tmp_path):
+    root = _tree(tmp_path)
+
+    assert "README.md" in _walked(root)
+
+
+def test_repo_loader_skips_vcs_and_build_dirs(tmp_path):
+    root = _tree(tmp_path)
+
+    assert sorted(os.path.relpath(path, root) for path, _ in load_all_files(root)) == [os.path.join("src", "app.ts")]
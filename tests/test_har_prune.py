@@ -0,0 +1,70 @@
+from utils.har_prune import prune_dom, prune_har
+
+
+def _entry(url, method="GET", status=200, mime="application/json", text=None, post=None):
+    request = {"method": method, "url": url, "headers": [{"name": "Cookie", "value": "secret"}]}
+    if post is not None:
+        request["postData"] = {"text": post}
+    return {
+        "request": request,
+        "response": {"status": status, "headers": [], "content": {"mimeType": mime, "text": text}},
+        "timings": {"wait": 12},
+    }
+
+
+def test_prune_har_drops_static_assets_and_unused_fields():
+    har = {"log": {"entries": [
+        _entry("https://shop.test/static/app.js?v=3", mime="application/javascript", text="code"),
+        _entry("https://shop.test/logo.PNG", mime="image/png"),
+        _entry("https://shop.test/api/cart", method="POST", status=201, text='{"items": 1}', post='{"id": 7}'),
+    ]}}
+
+    assert prune_har(har) == {"entries": [{
+        "method": "POST",
+        "url": "https://shop.test/api/cart",
+        "status": 201,
+        "mimeType": "application/json",
+        "postData": '{"id": 7}',
+        "responseBody": '{"items": 1}',
+    }]}
+
+
+def test_prune_har_keeps_only_json_response_bodies():
+    har = {"log": {"entries": [_entry("https://shop.test/cart", mime="text/html", text="<html>")]}}
+
+    assert prune_har(har) == {"entries": [{
+        "method": "GET",
+        "url": "https://shop.test/cart",
+        "status": 200,
+        "mimeType": "text/html",
+    }]}
+
+
+def test_prune_har_passes_through_missing_capture():
+    assert prune_har(None) is None
+    assert prune_har({}) == {}
+
+
+def test_prune_dom_keeps_identifying_fields_through_containers():
+    snapshot = {
+        "LoginPage": [{
+            "tag": "form",
+            "style": "display: block",
+            "attributes": {"class": "login", "data-testid": "login-form"},
+            "children": [
+                {"tag": "input", "name": "user", "boundingBox": [0, 0, 10, 10], "attributes": {"class": "x"}},
+                {"tagName": "BUTTON", "text": "Sign in", "role": "button"},
+            ],
+        }],
+    }
+
+    assert prune_dom(snapshot) == {
+        "LoginPage": [{
+            "tag": "form",
+            "attributes": {"data-testid": "login-form"},
+            "children": [
+                {"tag": "input", "name": "user"},
+                {"tagName": "BUTTON", "text": "Sign in", "role": "button"},
+            ],
+        }],
+    }
@@ -0,0 +1,40 @@
+from utils.llm_cache import cache_key, cached_completion
+
+
+def _counting_completion(calls, text="reply"):
+    def complete():
+        calls.append(text)
+        return text
+    return complete
+
+
+def test_identical_fields_are_answered_from_disk(tmp_path):
+    calls = []
+
+    first = cached_completion(tmp_path, _counting_completion(calls), prompt="p", model="m")
+    second = cached_completion(tmp_path, _counting_completion(calls), prompt="p", model="m")
+
+    assert first == second == "reply"
+    assert calls == ["reply"]
+
+
+def test_any_changed_field_misses(tmp_path):
+    calls = []
+
+    cached_completion(tmp_path, _counting_completion(calls), prompt="p", temperature=0.2)
+    cached_completion(tmp_path, _counting_completion(calls), prompt="p", temperature=0.3)
+
+    assert len(calls) == 2
+
+
+def test_cache_dir_none_disables_caching():
+    calls = []
+
+    cached_completion(None, _counting_completion(calls), prompt="p")
+    cached_completion(None, _counting_completion(calls), prompt="p")
+
+    assert len(calls) == 2
+
+
+def test_cache_key_ignores_field_order():
+    assert cache_key(a=1, b="x") == cache_key(b="x", a=1)
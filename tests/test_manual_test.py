@@ -0,0 +1,30 @@
+from utils.manual_test import parse_manual_test
+
+
+def test_markdown_is_split_on_section_headings(tmp_path):
+    path = tmp_path / "login.md"
+    path.write_text(
+        "# Login test\n"
+        "intro text\n"
+        "## Steps\n"
+        "1. Open the page\n"
+        "2. Sign in\n"
+        "\n"
+        "## Related Files  \n"
+        "- HAR Recording: [data/login.har]\n"
+    )
+
+    assert parse_manual_test(str(path)) == {
+        "Steps": "1. Open the page\n2. Sign in",
+        "Related Files": "- HAR Recording: [data/login.har]",
+    }
+
+
+def test_other_files_are_read_as_yaml(tmp_path):
+    path = tmp_path / "login.yaml"
+    path.write_text("Steps:\n  - Open the page\n  - Sign in\nPriority: high\n")
+
+    assert parse_manual_test(str(path)) == {
+        "Steps": ["Open the page", "Sign in"],
+        "Priority": "high",
+    }
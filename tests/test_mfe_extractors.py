@@ -0,0 +1,83 @@
+import generate_mfe_templates
+from generate_mfe_templates import (
+    extract_component,
+    extract_component_name,
+    extract_props,
+    extract_state_usage,
+    extract_test_id,
+)
+
+COMPONENT = """\
+import React, { useState } from 'react';
+
+interface LoginFormProps {
+  onSubmit: () => void;
+  title?: string;
+}
+
+export const LoginForm = ({ onSubmit, title }: LoginFormProps) => {
+  const [email, setEmail] = useState('');
+  const user = useSelector(state => state.auth.user);
+  return <form data-testid="login-form"><Button onClick={onSubmit} /></form>;
+};
+"""
+
+
+def test_component_name():
+    assert extract_component_name(COMPONENT) == "LoginForm"
+    assert extract_component_name("const helper = 1;") is None
+
+
+def test_props():
+    assert extract_props(COMPONENT) == ["onSubmit", "title?"]
+    assert extract_props("export const A = () => null;") == []
+
+
+def test_test_id():
+    assert extract_test_id(COMPONENT) == "login-form"
+    assert extract_test_id("<div />") is None
+
+
+def test_state_usage_finds_local_and_redux_state():
+    assert extract_state_usage(COMPONENT) == {
+        "email": {"type": "local", "default": "''"},
+        "auth.user": {"type": "redux", "selector": "state.auth.user"},
+    }
+
+
+def test_extract_component_regex_fallback(tmp_path, monkeypatch):
+    monkeypatch.setattr(generate_mfe_templates, "tsx_parser_available", lambda: False)
+    tsx_file = tmp_path / "src" / "LoginForm.tsx"
+    tsx_file.parent.mkdir()
+    tsx_file.write_text(COMPONENT)
+
+    info, child_names = extract_component(tsx_file, tmp_path)
+
+    assert info.name == "LoginForm"
+    assert info.path == "src/LoginForm.tsx"
+    assert info.props == ["onSubmit", "title?"]
+    assert info.test_id == "login-form"
+    assert set(info.state) == {"email", "auth.user"}
+    assert (info.children, info.events, info.api_endpoints) == ({}, {}, {})
+    assert child_names == []
+
+
+def test_extract_component_skips_files_without_a_component(tmp_path, monkeypatch):
+    monkeypatch.setattr(generate_mfe_templates, "tsx_parser_available", lambda: False)
+    tsx_file = tmp_path / "types.tsx"
+    tsx_file.write_text("type Id = string;\n")
+
+    assert extract_component(tsx_file, tmp_path) is None
+
+
+def test_analysis_cache_is_kept_outside_the_mfe_tree(tmp_path):
+    mfe_root = tmp_path / "mfe"
+    mfe_root.mkdir()
+    (mfe_root / "LoginForm.tsx").write_text(COMPONENT)
+
+    generator = generate_mfe_templates.MFETemplateGenerator(mfe_root)
+    generator._analyze_components()
+
+    assert [path.name for path in mfe_root.iterdir()] == ["LoginForm.tsx"]
+    assert generator._analysis_cache_path().is_file()
+    assert "LoginForm.tsx" in generate_mfe_templates.MFETemplateGenerator(mfe_root)._load_analysis_cache()
@@ -0,0 +1,60 @@
+import pytest
+
+from utils import framework_analyzer
+from utils.framework_analyzer import scan_page_object
+from utils.ts_parser import parse_page_object, ts_parser_available
+
+PAGE_OBJECT = b"""\
+import { Page } from '@playwright/test';
+
+export const submitButton = 'button[type=submit]';
+export const emailInput = '#email';
+
+@Fixture()
+export class LoginPage
+    extends BasePage
+    implements Navigable {
+  constructor(page: Page) {
+    super(page);
+  }
+
+  async fillEmail(
+    email: string,
+  ) {
+    await this.page.fill(emailInput, email);
+  }
+
+  async submit() {
+    await this.page.click(submitButton);
+  }
+
+  helper() {
+    return 1;
+  }
+}
+"""
+
+EXPECTED = (
+    "LoginPage",
+    {"submitButton": "button[type=submit]", "emailInput": "#email"},
+    ["fillEmail", "submit"],
+)
+
+
+@pytest.mark.skipif(not ts_parser_available(), reason="tree_sitter_languages not installed")
+def test_parse_page_object_handles_multi_line_decorated_class():
+    parsed = parse_page_object(PAGE_OBJECT)
+
+    assert (parsed.name, parsed.locators, parsed.methods) == EXPECTED
+
+
+@pytest.mark.skipif(not ts_parser_available(), reason="tree_sitter_languages not installed")
+def test_parse_page_object_without_exported_class():
+    assert parse_page_object(b"export const url = '/login';\n") is None
+
+
+def test_regex_fallback_scans_the_same_members(monkeypatch):
+    monkeypatch.setattr(framework_analyzer, "ts_parser_available", lambda: False)
+
+    assert scan_page_object(PAGE_OBJECT) == EXPECTED
+    assert scan_page_object(b"export const url = '/login';\n") is None
@@ -0,0 +1,61 @@
+import asyncio
+
+from chains import convert_manual_to_script
+from chains.convert_manual_to_script import update_page_objects_file
+from utils.cache_dir import tree_cache_dir
+
+
+class FakeManager:
+    def __init__(self):
+        self.update_calls = []
+
+    def generate_page_objects_updates(self, framework_analysis, page_objects):
+        self.update_calls.append(dict(page_objects))
+        return f"// getters for {', '.join(sorted(page_objects))}"
+
+
+def _update(manager, pages, base_dir):
+    return asyncio.run(update_page_objects_file(manager, {"page_getters": {}}, pages, base_dir))
+
+
+def test_unchanged_page_set_skips_the_update_call(tmp_path):
+    manager = FakeManager()
+    pages = {"LoginPage": "export class LoginPage {}"}
+
+    first = _update(manager, pages, tmp_path)
+    second = _update(manager, dict(pages), tmp_path)
+
+    assert first == second == "// getters for LoginPage"
+    assert len(manager.update_calls) == 1
+
+
+def test_changed_page_set_is_sent_again(tmp_path):
+    manager = FakeManager()
+
+    _update(manager, {"LoginPage": "export class LoginPage {}"}, tmp_path)
+    _update(manager, {"LoginPage": "export class LoginPage { async submit() {} }"}, tmp_path)
+
+    assert len(manager.update_calls) == 2
+
+
+def test_no_pages_means_no_update(tmp_path):
+    manager = FakeManager()
+
+    assert _update(manager, {}, tmp_path) is None
+    assert manager.update_calls == []
+
+
+def test_update_cache_is_bounded_and_outside_the_framework(tmp_path, monkeypatch):
+    monkeypatch.setattr(convert_manual_to_script, "GENERATION_CACHE_SIZE", 2)
+    manager = FakeManager()
+    framework = tmp_path / "framework"
+    framework.mkdir()
+
+    for index in range(3):
+        _update(manager, {f"Page{index}": "export class Page {}"}, framework)
+    _update(manager, {"Page0": "export class Page {}"}, framework)
+
+    assert len(manager.update_calls) == 4
+    assert list(framework.iterdir()) == []
+    cache_file = tree_cache_dir(framework) / convert_manual_to_script.PAGE_UPDATES_CACHE
+    assert cache_file.exists()
@@ -0,0 +1,53 @@
+import datetime
+import enum
+import uuid
+
+import pytest
+
+from utils import serialization
+from utils.serialization import dumps_json
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+DATA = {
+    "name": "Ünïcode",
+    1: [1, 2.5, None, True],
+    2.5: {"nested": (1, 2)},
+    None: False,
+    False: {},
+    Color.RED: [],
+    datetime.date(2024, 1, 2): "date",
+    uuid.UUID(int=1): "uuid",
+}
+
+COMPACT = (
+    '{"name":"Ünïcode","1":[1,2.5,null,true],"2.5":{"nested":[1,2]},"null":false,'
+    '"false":{},"red":[],"2024-01-02":"date","00000000-0000-0000-0000-000000000001":"uuid"}'
+)
+
+
+@pytest.fixture
+def stdlib_json(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+
+
+def test_fallback_is_compact(stdlib_json):
+    assert dumps_json(DATA) == COMPACT
+
+
+def test_fallback_indents_by_two(stdlib_json):
+    assert dumps_json({"a": {1: [1]}, "b": {}}, indent=True) == (
+        '{\n  "a": {\n    "1": [\n      1\n    ]\n  },\n  "b": {}\n}'
+    )
+
+
+@pytest.mark.parametrize("indent", [False, True])
+def test_orjson_and_fallback_agree(monkeypatch, indent):
+    pytest.importorskip("orjson")
+    with_orjson = dumps_json(DATA, indent=indent)
+    monkeypatch.setattr(serialization, "orjson", None)
+
+    assert dumps_json(DATA, indent=indent) == with_orjson
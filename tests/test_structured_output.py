@@ -0,0 +1,79 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+pytest.importorskip("langchain")
+
+from pydantic import BaseModel
+
+from utils import structured_output
+from utils.structured_output import astream_tool_arguments
+
+
+class Page(BaseModel):
+    name: str
+    path: str
+
+
+class Layout(BaseModel):
+    pages: List[Page]
+
+
+class FakeToolCallLLM:
+    """Streams the tool call arguments of a forced tool call in fixed-size pieces"""
+
+    def __init__(self, arguments: str, piece_size: int):
+        self.pieces = [arguments[i:i + piece_size] for i in range(0, len(arguments), piece_size)]
+
+    def bind_tools(self, tools, tool_choice):
+        return self
+
+    async def astream(self, messages):
+        yield SimpleNamespace(tool_call_chunks=[])
+        for piece in self.pieces:
+            yield SimpleNamespace(tool_call_chunks=[{"args": piece}])
+
+
+def _collect(llm):
+    async def collect():
+        return [item async for item in astream_tool_arguments(llm, Layout, [])]
+    return asyncio.run(collect())
+
+
+ARGUMENTS = json.dumps({"pages": [{"name": f"Page{i}", "path": f"/pages/{i}"} for i in range(40)]})
+
+
+def test_last_item_is_the_full_reply():
+    streamed = _collect(FakeToolCallLLM(ARGUMENTS, 7))
+
+    raw, arguments = streamed[-1]
+    assert raw == ARGUMENTS
+    assert arguments == json.loads(ARGUMENTS)
+
+
+def test_partial_arguments_grow_as_the_reply_streams():
+    streamed = _collect(FakeToolCallLLM(ARGUMENTS, 7))
+
+    page_counts = [len(arguments.get("pages", [])) for _, arguments in streamed]
+    assert len(streamed) > 2
+    assert page_counts == sorted(page_counts)
+    for raw, arguments in streamed:
+        assert ARGUMENTS.startswith(raw)
+        # Pages followed by a sibling are complete
+        for page in arguments["pages"][:-1]:
+            assert set(page) == {"name", "path"}
+
+
+def test_parses_are_spaced_out(monkeypatch):
+    monkeypatch.setattr(structured_output, "PARTIAL_PARSE_MIN_CHARS", 1)
+    streamed = _collect(FakeToolCallLLM(ARGUMENTS, 1))
+
+    # Growth by a quarter each time: logarithmic in the reply size, not one parse per piece
+    assert len(streamed) < 40
+
+
+def test_empty_reply_yields_nothing():
+    assert _collect(FakeToolCallLLM("", 7)) == []
@@ -0,0 +1,121 @@
+import pytest
+
+pytest.importorskip("langchain")
+faiss = pytest.importorskip("faiss")
+
+from langchain.embeddings import FakeEmbeddings
+from langchain.vectorstores import FAISS
+
+from utils import vector_store
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    index_dir = tmp_path / "index"
+    monkeypatch.setattr(vector_store, "INDEX_DIR", index_dir)
+    monkeypatch.setattr(vector_store, "INDEX_FINGERPRINT_FILE", index_dir / ".fingerprint")
+    monkeypatch.setattr(vector_store, "INDEX_MANIFEST_FILE", index_dir / "manifest.json")
+    monkeypatch.setattr(vector_store, "EMBEDDING_DIMENSIONS", 32)
+    monkeypatch.setattr(vector_store, "_cached_embeddings", lambda: FakeEmbeddings(size=32))
+    # A layout small enough to train on a handful of chunks
+    monkeypatch.setattr(vector_store, "INDEX_BATCH_SIZE", 8)
+    monkeypatch.setattr(vector_store, "IVF_LISTS", 2)
+    monkeypatch.setattr(vector_store, "PQ_SUBQUANTIZERS", 4)
+    monkeypatch.setattr(vector_store, "PQ_BITS", 4)
+    monkeypatch.setattr(vector_store, "IVF_PQ_MIN_VECTORS", 40)
+    return index_dir
+
+
+def _repo(tmp_path, files):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    for i in range(files):
+        (repo / f"module{i}.ts").write_text(f"export const value{i} = {i};\n")
+    return repo
+
+
+def _load(index_dir):
+    return FAISS.load_local(str(index_dir), FakeEmbeddings(size=32), allow_dangerous_deserialization=True)
+
+
+def test_small_repo_keeps_a_flat_index(tmp_path, index_dir):
+    vector_store.index_repo_code(_repo(tmp_path, 10))
+
+    db = _load(index_dir)
+    assert not isinstance(db.index, faiss.IndexIVF)
+    assert db.index.ntotal == len(db.index_to_docstore_id) == 10
+
+
+def test_large_repo_switches_to_ivf_pq(tmp_path, index_dir, monkeypatch):
+    flat_sizes = []
+    compress_index = vector_store._compress_index
+
+    def record_flat_size(db):
+        if not isinstance(db.index, faiss.IndexIVF):
+            flat_sizes.append(db.index.ntotal)
+        compress_index(db)
+
+    monkeypatch.setattr(vector_store, "_compress_index", record_flat_size)
+    vector_store.index_repo_code(_repo(tmp_path, 100))
+
+    # Trained on the first IVF_PQ_MIN_VECTORS; later batches went straight into IVF-PQ
+    assert max(flat_sizes) < 40 + vector_store.INDEX_BATCH_SIZE
+
+    db = _load(index_dir)
+    assert isinstance(db.index, faiss.IndexIVFPQ)
+    assert db.index.ntotal == len(db.index_to_docstore_id) == 100
+    assert len(db.similarity_search("value7", k=3)) == 3
+
+
+def _sources(db):
+    return sorted(doc.metadata["source"].rsplit("/", 1)[1] for doc in db.docstore._dict.values())
+
+
+def test_changed_files_are_replaced_in_place(tmp_path, index_dir, monkeypatch):
+    repo = _repo(tmp_path, 3)
+    vector_store.index_repo_code(repo)
+    first = _load(index_dir)
+    kept_ids = {chunk_id for chunk_id in first.index_to_docstore_id.values() if "module0.ts" in chunk_id}
+
+    (repo / "module1.ts").write_text("export const edited = 1;\n")
+    (repo / "module2.ts").unlink()
+    (repo / "module3.ts").write_text("export const added = 3;\n")
+    embedded = []
+    aembed_batches = vector_store._aembed_batches
+
+    async def record_embedded(embeddings, batches):
+        embedded.extend(chunk.page_content for batch in batches for chunk in batch)
+        return await aembed_batches(embeddings, batches)
+
+    monkeypatch.setattr(vector_store, "_aembed_batches", record_embedded)
+    vector_store.index_repo_code(repo)
+
+    db = _load(index_dir)
+    assert sorted(embedded) == ["export const added = 3;", "export const edited = 1;"]
+    assert _sources(db) == ["module0.ts", "module1.ts", "module3.ts"]
+    assert kept_ids <= set(db.index_to_docstore_id.values())
+    assert db.index.ntotal == len(db.index_to_docstore_id) == 3
+    assert db.similarity_search("edited", k=3)
+
+
+def test_unchanged_repo_is_not_reindexed(tmp_path, index_dir, monkeypatch):
+    repo = _repo(tmp_path, 3)
+    vector_store.index_repo_code(repo)
+    monkeypatch.setattr(vector_store, "_load_index", None)
+
+    vector_store.index_repo_code(repo)
+
+
+def test_removed_files_are_dropped_from_an_ivf_pq_index(tmp_path, index_dir):
+    repo = _repo(tmp_path, 60)
+    vector_store.index_repo_code(repo)
+
+    for i in range(10):
+        (repo / f"module{i}.ts").unlink()
+    vector_store.index_repo_code(repo)
+
+    db = _load(index_dir)
+    assert isinstance(db.index, faiss.IndexIVFPQ)
+    assert db.index.ntotal == len(db.index_to_docstore_id) == 50
+    found = db.similarity_search_with_score("value", k=50)
+    assert len(found) == 50
@@ -0,0 +1,34 @@
+import hashlib
+import os
+from pathlib import Path
+
+# Overrides the directory every cache of this tool is kept under
+CACHE_DIR_ENV = "AUTO_PLAYWRIGHT_CACHE_DIR"
+CACHE_DIR_NAME = "auto-playwright-tests"
+
+
+def cache_root() -> Path:
+    """
+    Directory this tool owns for all of its caches
+
+    $AUTO_PLAYWRIGHT_CACHE_DIR when set, else auto-playwright-tests under
+    $XDG_CACHE_HOME (~/.cache by default). Caches never go into the trees
+    being read, which may belong to someone else.
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override)
+    xdg_cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(xdg_cache) / CACHE_DIR_NAME
+
+
+def path_key(path: str | os.PathLike) -> str:
+    """Stable file name for a path: its base name plus a hash of the absolute path"""
+    resolved = os.path.realpath(path)
+    digest = hashlib.blake2b(resolved.encode("utf-8"), digest_size=8).hexdigest()
+    return f"{os.path.basename(resolved) or 'root'}-{digest}"
+
+
+def tree_cache_dir(root: str | os.PathLike) -> Path:
+    """Cache directory for one analyzed tree, keyed by its absolute path"""
+    return cache_root() / "trees" / path_key(root)
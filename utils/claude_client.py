@@ -1,17 +1,56 @@
 import os
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Dict, List, Optional, Union
 
+from utils.llm_cache import DEFAULT_CACHE_DIR, cached_completion
+
+# Upper bound on in-flight Claude requests from predict_in_chunks
+MAX_CONCURRENT_REQUESTS = 8
+# (connect, read) timeouts in seconds; the read timeout covers generating the whole reply
+REQUEST_TIMEOUT = (5, 120)
+
 class ClaudeClient:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR):
         self.api_key = api_key
+        self.model = "claude-3-sonnet-20240229"
+        self.cache_dir = cache_dir
         self.base_url = "https://api.anthropic.com/v1/messages"
         self.headers = {
             "x-api-key": api_key,
             "anthropic-version": "2023-06-01",
             "content-type": "application/json"
         }
+        self._session = self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        """Session that keeps connections alive across predict calls and retries transient errors"""
+        session = requests.Session()
+        session.headers.update(self.headers)
+        # Only retry where the server cannot have started a completion: failed
+        # connects, and 429/503 which reject the request before processing it.
+        # Read timeouts and other 5xx may follow a billed completion, so a
+        # retried POST could run the same generation twice.
+        retry = Retry(
+            total=3,
+            connect=3,
+            read=0,
+            status_forcelist=(429, 503),
+            backoff_factor=0.5,
+            allowed_methods=None
+        )
+        # Pool sized for the concurrent requests predict_in_chunks makes
+        adapter = HTTPAdapter(
+            pool_connections=MAX_CONCURRENT_REQUESTS,
+            pool_maxsize=2 * MAX_CONCURRENT_REQUESTS,
+            max_retries=retry
+        )
+        session.mount("https://", adapter)
+        return session
 
     def predict(self, 
                 system_prompt: str,
@@ -19,11 +58,26 @@ class ClaudeClient:
                 max_tokens: int = 4096,
                 temperature: float = 0.2) -> str:
         """
-        Send a prediction request to Claude API
+        Send a prediction request to Claude API, reusing cached responses
         """
+        return cached_completion(
+            self.cache_dir,
+            lambda: self._predict(system_prompt, user_message, max_tokens, temperature),
+            system_prompt=system_prompt,
+            user_message=user_message,
+            model=self.model,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+
+    def _predict(self,
+                 system_prompt: str,
+                 user_message: str,
+                 max_tokens: int,
+                 temperature: float) -> str:
         try:
             data = {
-                "model": "claude-3-sonnet-20240229",
+                "model": self.model,
                 "max_tokens": max_tokens,
                 "temperature": temperature,
                 "messages": [
@@ -32,10 +86,10 @@ class ClaudeClient:
                 ]
             }
             
-            response = requests.post(
+            response = self._session.post(
                 self.base_url,
-                headers=self.headers,
-                json=data
+                json=data,
+                timeout=REQUEST_TIMEOUT
             )
             response.raise_for_status()
             
@@ -50,15 +104,18 @@ class ClaudeClient:
                          max_tokens: int = 4096,
                          temperature: float = 0.2) -> List[str]:
         """
-        Send multiple prediction requests to Claude API and combine results
+        Send multiple prediction requests to Claude API concurrently, results in input order
         """
-        results = []
-        for message in user_messages:
-            result = self.predict(
-                system_prompt=system_prompt,
-                user_message=message,
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
-            results.append(result)
-        return results 
\ No newline at end of file
+        if not user_messages:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(user_messages), MAX_CONCURRENT_REQUESTS)) as executor:
+            return list(executor.map(
+                lambda message: self.predict(
+                    system_prompt=system_prompt,
+                    user_message=message,
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                ),
+                user_messages
+            ))
+ 
\ No newline at end of file
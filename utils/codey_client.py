@@ -1,14 +1,20 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import List, Optional
-from langchain_google_vertexai import VertexAI
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+
+from utils.llm_cache import DEFAULT_CACHE_DIR, cached_completion
+
+# Upper bound on in-flight Vertex AI requests per client, across all callers
+MAX_CONCURRENT_REQUESTS = 8
 
 class CodeyClient:
     def __init__(self, 
                  project_id: str,
                  location: str = "us-central1",
                  max_output_tokens: int = 1024,
-                 temperature: float = 0.2):
+                 temperature: float = 0.2,
+                 cache_dir: Optional[Path] = DEFAULT_CACHE_DIR):
         """
         Initialize Codey client using code-bison model
         
@@ -17,34 +23,46 @@ class CodeyClient:
             location: GCP region
             max_output_tokens: Maximum number of tokens in the response
             temperature: Temperature for response generation
+            cache_dir: Directory for cached responses, or None to disable
         """
+        self.model_name = "code-bison"
+        self.max_output_tokens = max_output_tokens
+        self.temperature = temperature
+        self.cache_dir = cache_dir
+        self._request_slots = threading.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # Imported here so merely importing this module doesn't load the Vertex AI SDK
+        from langchain_google_vertexai import VertexAI
         self.llm = VertexAI(
-            model_name="code-bison",
+            model_name=self.model_name,
             project=project_id,
             location=location,
             max_output_tokens=max_output_tokens,
-            temperature=temperature
+            temperature=temperature,
+            # predict() already caches completions on disk; skip any global LangChain cache
+            cache=False
         )
 
     def predict(self, 
                 system_prompt: str,
                 user_message: str) -> str:
         """
-        Send a prediction request to Codey
+        Send a prediction request to Codey, reusing cached responses
         """
+        return cached_completion(
+            self.cache_dir,
+            lambda: self._predict(system_prompt, user_message),
+            system_prompt=system_prompt,
+            user_message=user_message,
+            model=self.model_name,
+            temperature=self.temperature,
+            max_output_tokens=self.max_output_tokens
+        )
+
+    def _predict(self, system_prompt: str, user_message: str) -> str:
         try:
-            # Create prompt template
-            template = f"{system_prompt}\n\n{{user_input}}"
-            prompt = PromptTemplate(
-                template=template,
-                input_variables=["user_input"]
-            )
-            
-            # Create chain
-            chain = LLMChain(llm=self.llm, prompt=prompt)
-            
-            # Get prediction
-            return chain.predict(user_input=user_message)
+            # The prompt is plain concatenation, so skip PromptTemplate/LLMChain
+            with self._request_slots:
+                return self.llm.invoke(f"{system_prompt}\n\n{user_message}")
             
         except Exception as e:
             raise Exception(f"Error calling Codey API: {str(e)}")
@@ -53,13 +71,15 @@ class CodeyClient:
                          system_prompt: str,
                          user_messages: List[str]) -> List[str]:
         """
-        Send multiple prediction requests to Codey and combine results
+        Send multiple prediction requests to Codey concurrently, results in input order
         """
-        results = []
-        for message in user_messages:
-            result = self.predict(
-                system_prompt=system_prompt,
-                user_message=message
-            )
-            results.append(result)
-        return results 
\ No newline at end of file
+        if not user_messages:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(user_messages), MAX_CONCURRENT_REQUESTS)) as executor:
+            return list(executor.map(
+                lambda message: self.predict(
+                    system_prompt=system_prompt,
+                    user_message=message
+                ),
+                user_messages
+            ))
@@ -0,0 +1,71 @@
+import os
+import pickle
+from typing import Any, Callable
+
+from utils.cache_dir import cache_root, path_key
+
+# Bump when a loader's parsing changes so stale cached results are ignored
+CACHE_VERSION = 3
+# Parsed input files, under cache_root()
+PARSED_CACHE_DIR = "parsed"
+
+# What a missing, truncated or outdated pickle raises on load; all mean "not cached"
+CACHE_LOAD_ERRORS = (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError)
+
+_MISSING = object()
+
+
+def write_atomic(path: str | os.PathLike, data: bytes) -> None:
+    """Write data through a per-process temp file so readers never see a partial file"""
+    path = os.fspath(path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load_pickle(path: str | os.PathLike, key: Any, default: Any = None) -> Any:
+    """Data stored by store_pickle under key, or default if missing, unreadable or keyed differently"""
+    try:
+        with open(path, "rb") as f:
+            stored_key, data = pickle.load(f)
+    except CACHE_LOAD_ERRORS:
+        return default
+    return data if stored_key == key else default
+
+
+def store_pickle(path: str | os.PathLike, key: Any, data: Any) -> None:
+    """Pickle (key, data) to path, creating its directory; failures are ignored"""
+    try:
+        os.makedirs(os.path.dirname(os.fspath(path)) or ".", exist_ok=True)
+        write_atomic(path, pickle.dumps((key, data), protocol=5))
+    except OSError:
+        # Caching is best effort; a read-only tree still works without it
+        pass
+
+
+def cached_load(path: str | os.PathLike, parser: Callable[[str], Any]) -> Any:
+    """
+    Parse a file through a pickled copy of the result in the tool's cache
+
+    The copy is reused while it is newer than the source file and was
+    written by the same CACHE_VERSION and parser; otherwise the file is
+    re-parsed and the copy rewritten. Copies live under cache_root(), never
+    next to the user's files.
+    """
+    path = os.fspath(path)
+    cache_path = cache_root() / PARSED_CACHE_DIR / f"{path_key(path)}.pkl"
+    cache_key = (CACHE_VERSION, os.path.realpath(path), parser.__module__, parser.__qualname__)
+
+    try:
+        fresh = os.path.getmtime(cache_path) >= os.path.getmtime(path)
+    except OSError:
+        fresh = False
+    if fresh:
+        data = load_pickle(cache_path, cache_key, _MISSING)
+        if data is not _MISSING:
+            return data
+
+    data = parser(path)
+    store_pickle(cache_path, cache_key, data)
+    return data
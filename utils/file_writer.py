@@ -1,7 +1,31 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict
 
-from chains.convert_manual_to_script import TestComponents
+from chains.test_generation_manager import TestComponents
+
+# Page objects go to separate files, so a few can be written at once
+PAGE_WRITE_WORKERS = 4
+
+
+def _write_new_file(path: Path, content: str) -> None:
+    """Write path only if it doesn't exist yet; the check and create are one open call"""
+    try:
+        with open(path, "xb") as f:
+            f.write(content.encode("utf-8"))
+    except FileExistsError:
+        pass
+
+
+def _append_to_file(path: Path, content: str) -> None:
+    """Append content on a new line, creating the file if needed, without rereading it"""
+    with open(path, "ab+") as f:
+        if f.seek(0, os.SEEK_END):
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+        f.write(content.encode("utf-8"))
 
 
 def write_test_components(
@@ -21,27 +45,19 @@ def write_test_components(
     
     # Write feature file
     feature_file = feature_dir / f"{feature_name}.feature"
-    feature_file.write_text(components.feature_file)
+    feature_file.write_bytes(components.feature_file.encode("utf-8"))
     
     # Write step definitions
     step_def_file = step_def_dir / f"{feature_name}.steps.ts"
-    step_def_file.write_text(components.step_definitions)
+    step_def_file.write_bytes(components.step_definitions.encode("utf-8"))
     
-    # Write page objects
-    for page_name, content in components.page_objects.items():
-        page_file = page_dir / f"{page_name}.ts"
-        if not page_file.exists():  # Only write if file doesn't exist
-            page_file.write_text(content)
+    # Write page objects, leaving existing files untouched
+    with ThreadPoolExecutor(max_workers=PAGE_WRITE_WORKERS) as executor:
+        list(executor.map(
+            lambda page: _write_new_file(page_dir / f"{page[0]}.ts", page[1]),
+            components.page_objects.items()
+        ))
             
     # Update PageObjects.ts if needed
     if components.page_objects_updates:
-        page_objects_file = page_dir / "PageObjects.ts"
-        if page_objects_file.exists():
-            # Append updates to existing file
-            current_content = page_objects_file.read_text()
-            if not current_content.endswith('\n'):
-                current_content += '\n'
-            page_objects_file.write_text(current_content + components.page_objects_updates)
-        else:
-            # Create new file
-            page_objects_file.write_text(components.page_objects_updates) 
\ No newline at end of file
+        _append_to_file(page_dir / "PageObjects.ts", components.page_objects_updates)
@@ -1,13 +1,65 @@
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 import re
 import ast
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, fields
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from functools import lru_cache
+
+try:
+    import re2
+except ImportError:  # pragma: no cover - google-re2 is optional
+    re2 = None
 
 from config import FrameworkConfig
+from utils.fs_walk import PARALLEL_MIN_FILES
+from utils.source_bytes import source_bytes
+from utils.ts_parser import parse_page_object, ts_parser_available
+
+
+def _compile(pattern: bytes):
+    """Compile with RE2's linear-time engine when available, else the stdlib"""
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
+
+# Patterns run against every framework source file, compiled once
+# PageObjects.ts grows with every page, so it is scanned as raw (possibly
+# memory-mapped) bytes; RE2 can't search an mmap, hence the stdlib engine
+PAGE_GETTER_PATTERN = re.compile(rb'static\s+get\s+(\w+)\s*\(\)\s*{\s*return\s+new\s+(\w+)')
+METHOD_PATTERN = _compile(rb'async\s+(\w+)\s*\([^)]*\)\s*{')
+PROPERTY_PATTERN = _compile(rb'(\w+):\s*[^;]+;')
+# Regex fallback for page object files: class name, exported locators and
+# async methods in one alternation, so each file is scanned once
+PAGE_MEMBER_PATTERN = _compile(
+    rb'export\s+class\s+(?P<class_name>\w+)'
+    rb'|export\s+const\s+(?P<locator_name>\w+)\s*=\s*[\'"](?P<locator_value>[^\'"]+)[\'"]'
+    rb'|async\s+(?P<method>\w+)\s*\([^)]*\)\s*{'
+)
+
+# Source texts kept for repeat analyses; keyed by stat, so edits miss the cache
+READ_CACHE_SIZE = 1024
+
+# Bump when analysis output changes so analyses cached between runs are ignored
+ANALYSIS_CACHE_VERSION = 1
+
+
+def _field_state(self) -> dict:
+    return {field.name: getattr(self, field.name) for field in fields(self)}
+
 
+def _set_field_state(self, state: dict) -> None:
+    for name, value in state.items():
+        object.__setattr__(self, name, value)
 
-@dataclass
+
+@dataclass(slots=True)
 class PageObjectInfo:
     name: str
     locators: Dict[str, str]
@@ -15,8 +67,12 @@ class PageObjectInfo:
     extends_base: bool
     getter_name: str  # Name of the getter in PageObjects.ts
 
+    # Slots drop __dict__; keep pickles and YAML prompt dumps keyed by field name
+    __getstate__ = _field_state
+    __setstate__ = _set_field_state
+
 
-@dataclass
+@dataclass(slots=True)
 class FrameworkAnalysis:
     base_page_methods: List[str]
     world_context_properties: List[str]
@@ -24,6 +80,93 @@ class FrameworkAnalysis:
     common_patterns: Dict[str, str]
     page_getters: Dict[str, str]  # Mapping of page name to getter method
 
+    __getstate__ = _field_state
+    __setstate__ = _set_field_state
+
+
+@lru_cache(maxsize=READ_CACHE_SIZE)
+def _read_version(path: Path, mtime_ns: int, size: int) -> bytes:
+    return path.read_bytes()
+
+
+def _read_source(path: Path) -> bytes:
+    """
+    Raw file bytes, served from memory while the file is unchanged since the last read
+
+    Patterns and the tree-sitter parser all work on bytes, so only captured
+    names are ever decoded, never whole files.
+    """
+    stat = path.stat()
+    return _read_version(path, stat.st_mtime_ns, stat.st_size)
+
+
+def _decode(captured: bytes) -> str:
+    return captured.decode("utf-8", errors="ignore")
+
+
+def scan_page_object(content: bytes) -> Optional[Tuple[str, Dict[str, str], List[str]]]:
+    """Class name, exported locators and async methods of a page object file"""
+    if ts_parser_available():
+        parsed = parse_page_object(content)
+        if parsed is None:
+            return None
+        return parsed.name, parsed.locators, parsed.methods
+
+    # Regex fallback when tree_sitter_languages isn't installed
+    class_name = None
+    locators = {}
+    methods = []
+    for match in PAGE_MEMBER_PATTERN.finditer(content):
+        # Unpacked by position: RE2 keys named groups by bytes for bytes patterns
+        found_class, locator_name, locator_value, method = match.groups()
+        if found_class:
+            class_name = class_name or _decode(found_class)
+        elif locator_name:
+            locators[_decode(locator_name)] = _decode(locator_value)
+        else:
+            methods.append(_decode(method))
+
+    if not class_name:
+        return None
+    return class_name, locators, methods
+
+
+def analyze_page_file(page_file: Path, existing_getters: Dict[str, str]) -> Optional[PageObjectInfo]:
+    """
+    Analyze one page object file; None when it exports no class
+
+    Module level so ProcessPoolExecutor workers can run it.
+    """
+    content = _read_source(page_file)
+    scanned = scan_page_object(content)
+    if scanned is None:
+        return None
+
+    name, locators, methods = scanned
+    return PageObjectInfo(
+        name=name,
+        locators=locators,
+        methods=methods,
+        # Check if extends BasePage
+        extends_base=b"extends BasePage" in content,
+        # Existing getter from PageObjects.ts, else the default name
+        getter_name=existing_getters.get(name, f"get{name}")
+    )
+
+
+def _intern_names(page_object: PageObjectInfo) -> PageObjectInfo:
+    """
+    Share one string object per identifier across all page objects
+
+    Method and locator names repeat heavily between pages. Done in the parent
+    process, since strings unpickled from workers are never interned.
+    """
+    page_object.name = sys.intern(page_object.name)
+    page_object.getter_name = sys.intern(page_object.getter_name)
+    page_object.methods = [sys.intern(method) for method in page_object.methods]
+    page_object.locators = {sys.intern(name): value for name, value in page_object.locators.items()}
+    return page_object
+
 
 class FrameworkAnalyzer:
     def __init__(self, config: FrameworkConfig):
@@ -32,7 +175,9 @@ class FrameworkAnalyzer:
 
     def analyze_framework(self) -> FrameworkAnalysis:
         """Analyze the framework structure and return insights"""
-        # First analyze PageObjects.ts to get existing getters
+        # First analyze PageObjects.ts to get existing getters; start afresh so
+        # getters removed since a previous analysis don't linger
+        self._existing_page_getters = {}
         self._analyze_page_objects_file()
         
         base_methods = self._analyze_base_page()
@@ -48,19 +193,29 @@ class FrameworkAnalyzer:
             page_getters=self._existing_page_getters
         )
 
+    def input_paths(self) -> List[Path]:
+        """Every file analyze_framework reads, present or not"""
+        paths = [
+            path for path in (
+                self.config.page_objects_file, self.config.base_page_path, self.config.world_context_path
+            )
+            if path is not None
+        ]
+        if self.config.page_objects_dir.exists():
+            paths.extend(self.config.page_objects_dir.glob("*.ts"))
+        return paths
+
     def _analyze_page_objects_file(self) -> None:
         """Analyze PageObjects.ts to extract existing page getters"""
         if not self.config.page_objects_file or not self.config.page_objects_file.exists():
             return
         
-        content = self.config.page_objects_file.read_text()
-        
-        # Extract getter methods for pages
-        getter_pattern = r'static\s+get\s+(\w+)\s*\(\)\s*{\s*return\s+new\s+(\w+)'
-        matches = re.findall(getter_pattern, content)
+        with source_bytes(self.config.page_objects_file) as content:
+            # Extract getter methods for pages
+            matches = PAGE_GETTER_PATTERN.findall(content)
         
         for getter_name, page_class in matches:
-            self._existing_page_getters[page_class] = getter_name
+            self._existing_page_getters[sys.intern(_decode(page_class))] = sys.intern(_decode(getter_name))
 
     def _analyze_base_page(self) -> List[str]:
         """Extract common methods from base page"""
@@ -68,11 +223,10 @@ class FrameworkAnalyzer:
             return []
         
         methods = []
-        content = self.config.base_page_path.read_text()
+        content = _read_source(self.config.base_page_path)
         
         # Extract method names using regex
-        method_pattern = r'async\s+(\w+)\s*\([^)]*\)\s*{'
-        methods = re.findall(method_pattern, content)
+        methods = [_decode(method) for method in METHOD_PATTERN.findall(content)]
         return methods
 
     def _analyze_world_context(self) -> List[str]:
@@ -81,11 +235,10 @@ class FrameworkAnalyzer:
             return []
         
         properties = []
-        content = self.config.world_context_path.read_text()
+        content = _read_source(self.config.world_context_path)
         
         # Extract properties from World interface/class
-        prop_pattern = r'(\w+):\s*[^;]+;'
-        properties = re.findall(prop_pattern, content)
+        properties = [_decode(prop) for prop in PROPERTY_PATTERN.findall(content)]
         return properties
 
     def _analyze_page_objects(self) -> Dict[str, PageObjectInfo]:
@@ -95,45 +248,23 @@ class FrameworkAnalyzer:
         if not self.config.page_objects_dir.exists():
             return page_objects
 
-        for page_file in self.config.page_objects_dir.glob("*.ts"):
-            if page_file.name == "base_page.ts" or page_file.name == "PageObjects.ts":
-                continue
-                
-            content = page_file.read_text()
-            
-            # Extract class name
-            class_pattern = r'export\s+class\s+(\w+)'
-            class_matches = re.findall(class_pattern, content)
-            if not class_matches:
-                continue
-                
-            class_name = class_matches[0]
-            
-            # Extract locators
-            locator_pattern = r'export\s+const\s+(\w+)\s*=\s*[\'"]([^\'"]+)[\'"]'
-            locators = dict(re.findall(locator_pattern, content))
-            
-            # Extract methods
-            method_pattern = r'async\s+(\w+)\s*\([^)]*\)\s*{'
-            methods = re.findall(method_pattern, content)
-            
-            # Check if extends BasePage
-            extends_base = "extends BasePage" in content
-            
-            # Get or generate getter name
-            getter_name = self._existing_page_getters.get(
-                class_name,
-                f"get{class_name}"  # Default getter name if not found
-            )
-            
-            page_objects[class_name] = PageObjectInfo(
-                name=class_name,
-                locators=locators,
-                methods=methods,
-                extends_base=extends_base,
-                getter_name=getter_name
-            )
-            
+        page_files = [
+            page_file for page_file in self.config.page_objects_dir.glob("*.ts")
+            if page_file.name != "base_page.ts" and page_file.name != "PageObjects.ts"
+        ]
+        if len(page_files) > PARALLEL_MIN_FILES:
+            # Each file is independent CPU work, so spread it across cores
+            with ProcessPoolExecutor() as executor:
+                analyzed = list(executor.map(
+                    analyze_page_file, page_files, repeat(self._existing_page_getters), chunksize=8
+                ))
+        else:
+            analyzed = [analyze_page_file(page_file, self._existing_page_getters) for page_file in page_files]
+
+        for page_object in analyzed:
+            if page_object is not None:
+                page_objects[page_object.name] = _intern_names(page_object)
+
         return page_objects
 
     def _extract_common_patterns(self) -> Dict[str, str]:
@@ -0,0 +1,62 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import FrozenSet, Iterable, Iterator, Tuple
+
+# Installed dependencies never hold source we analyze
+SKIPPED_DIRS = frozenset({"node_modules"})
+# VCS and build output trees; callers that only want hand-written source opt
+# in with SKIPPED_DIRS | VCS_AND_BUILD_DIRS
+VCS_AND_BUILD_DIRS = frozenset({".git", "dist", "build"})
+
+# Fewer files than this are processed in-process: per-file work is small, so
+# starting a worker pool would cost more than it saves
+PARALLEL_MIN_FILES = 64
+
+
+def walk_files(
+    root: str | os.PathLike,
+    suffixes: Tuple[str, ...] = (),
+    skip_dirs: FrozenSet[str] = SKIPPED_DIRS
+) -> Iterator[Path]:
+    """
+    Yield files under root whose names end with one of suffixes
+
+    Directories named in skip_dirs are pruned before they are entered, so
+    their contents are never listed or stat'ed. An empty suffixes tuple
+    yields every file.
+    """
+    pending = [os.fspath(root)]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in skip_dirs:
+                        pending.append(entry.path)
+                elif not suffixes or entry.name.endswith(suffixes):
+                    yield Path(entry.path)
+
+
+def fingerprint_files(paths: Iterable[str | os.PathLike]) -> str:
+    """
+    Hash the path, mtime and size of each file
+
+    Order doesn't matter, and a missing file hashes differently from any
+    present one, so creating or deleting an input changes the fingerprint.
+    """
+    entries = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            entries.append(f"{os.fspath(path)}\0{stat.st_mtime_ns}\0{stat.st_size}")
+        except OSError:
+            entries.append(f"{os.fspath(path)}\0missing")
+    digest = hashlib.blake2b(digest_size=16)
+    for entry in sorted(entries):
+        digest.update(entry.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
@@ -0,0 +1,72 @@
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+# Requests for these never carry anything the generated tests assert on
+STATIC_ASSET_EXTENSIONS = (
+    ".css", ".js", ".map",
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".webp",
+    ".woff", ".woff2", ".ttf", ".eot",
+)
+
+# Element fields that identify a node for locators; everything else is dropped
+DOM_KEPT_FIELDS = frozenset({
+    "tag", "tagName", "id", "data-testid", "name", "aria-label", "role", "text",
+})
+
+
+def _is_static_asset(url: str) -> bool:
+    return urlsplit(url).path.lower().endswith(STATIC_ASSET_EXTENSIONS)
+
+
+def prune_har(har: Optional[dict]) -> Optional[Dict[str, List[dict]]]:
+    """Reduce a HAR capture to the request/response fields used in prompts"""
+    if not har:
+        return har
+
+    entries = []
+    for entry in har.get("log", {}).get("entries", []):
+        request = entry.get("request", {})
+        response = entry.get("response", {})
+        url = request.get("url", "")
+        if _is_static_asset(url):
+            continue
+
+        content = response.get("content", {})
+        pruned = {
+            "method": request.get("method"),
+            "url": url,
+            "status": response.get("status"),
+            "mimeType": content.get("mimeType"),
+        }
+        post_data = request.get("postData", {}).get("text")
+        if post_data:
+            pruned["postData"] = post_data
+        # API responses are the source of truth for data validation steps
+        if "json" in (pruned["mimeType"] or "") and content.get("text"):
+            pruned["responseBody"] = content["text"]
+        entries.append(pruned)
+
+    return {"entries": entries}
+
+
+def prune_dom(node: Any) -> Any:
+    """Strip DOM snapshot elements down to their identifying fields"""
+    if isinstance(node, list):
+        return [prune_dom(child) for child in node]
+    if not isinstance(node, dict):
+        return node
+
+    # Containers (e.g. page name -> elements) are walked without pruning
+    if "tag" not in node and "tagName" not in node:
+        return {key: prune_dom(value) for key, value in node.items()}
+
+    pruned = {key: value for key, value in node.items() if key in DOM_KEPT_FIELDS}
+    attributes = node.get("attributes")
+    if isinstance(attributes, dict):
+        kept = {key: value for key, value in attributes.items() if key in DOM_KEPT_FIELDS}
+        if kept:
+            pruned["attributes"] = kept
+    children = node.get("children")
+    if children:
+        pruned["children"] = prune_dom(children)
+    return pruned
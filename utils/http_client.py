@@ -0,0 +1,25 @@
+from functools import lru_cache
+import importlib.util
+import httpx
+
+# Enough keep-alive connections for a full batch of concurrent LLM requests
+MAX_KEEPALIVE_CONNECTIONS = 32
+MAX_CONNECTIONS = 64
+
+
+@lru_cache(maxsize=None)
+def shared_http_client() -> httpx.Client:
+    """
+    One pooled HTTP client for all OpenAI chat models in the process
+
+    Connections are kept alive between calls so batched requests reuse TLS
+    sessions, and multiplexed over HTTP/2 when the h2 package is installed.
+    """
+    return httpx.Client(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            max_connections=MAX_CONNECTIONS
+        ),
+        timeout=httpx.Timeout(600.0, connect=10.0)
+    )
@@ -0,0 +1,67 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Callable, Optional
+
+from utils.cache_dir import cache_root
+from utils.file_cache import write_atomic
+
+# Completions stored by cached_completion, in the tool's own cache directory
+# rather than wherever the CLI happens to be launched from
+DEFAULT_CACHE_DIR = cache_root() / "completions"
+# SQLite cache behind enable_langchain_cache, also under the tool cache root
+LANGCHAIN_CACHE_PATH = str(cache_root() / "langchain.db")
+
+
+def cache_key(**fields) -> str:
+    """Hash everything that determines a completion into a stable key"""
+    payload = json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cached_completion(
+    cache_dir: Optional[Path],
+    complete: Callable[[], str],
+    **fields
+) -> str:
+    """
+    Return a stored completion for these fields, or call complete() and store it
+
+    fields should cover the system prompt, user prompt, model and sampling
+    settings; prompt template text is part of the user prompt, so editing a
+    template changes the key. Passing cache_dir=None disables caching.
+    """
+    if cache_dir is None:
+        return complete()
+
+    cache_file = Path(cache_dir) / f"{cache_key(**fields)}.txt"
+    try:
+        return cache_file.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        pass
+
+    result = complete()
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(cache_file, result.encode("utf-8"))
+    except OSError:
+        # A cache write failure shouldn't lose a paid-for response
+        pass
+    return result
+
+
+def enable_langchain_cache(database_path: str = LANGCHAIN_CACHE_PATH) -> None:
+    """
+    Serve repeated LangChain model calls from a local SQLite cache
+
+    LangChain keys entries on the rendered prompt plus the model's
+    parameters (model name, temperature, ...), so only identical requests hit.
+    """
+    from langchain.cache import SQLiteCache
+    from langchain.globals import get_llm_cache, set_llm_cache
+
+    current = get_llm_cache()
+    if isinstance(current, SQLiteCache) and str(current.engine.url).endswith(database_path):
+        return
+    Path(database_path).parent.mkdir(parents=True, exist_ok=True)
+    set_llm_cache(SQLiteCache(database_path=database_path))
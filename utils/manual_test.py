@@ -0,0 +1,21 @@
+import re
+import yaml
+
+# Split points for "## Section" headings; re.split yields
+# [preamble, name1, body1, name2, body2, ...]
+SECTION_HEADING_PATTERN = re.compile(r'^##[ \t]+(.+?)[ \t]*$\n?', re.MULTILINE)
+
+
+def parse_manual_test(path: str) -> dict:
+    """
+    Parse a manual test into a {section: body} dict
+
+    Markdown files are split on their "## " headings; anything else is
+    read as YAML.
+    """
+    with open(path) as f:
+        if not path.endswith(".md"):
+            return yaml.safe_load(f)
+        content = f.read()
+    parts = SECTION_HEADING_PATTERN.split(content)
+    return {name: body.strip() for name, body in zip(parts[1::2], parts[2::2])}
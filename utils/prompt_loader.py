@@ -0,0 +1,49 @@
+import os
+from fnmatch import fnmatch
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Tuple
+
+if TYPE_CHECKING:
+    from langchain.prompts import PromptTemplate
+
+
+@lru_cache(maxsize=None)
+def _read_prompt(prompt_file: Path) -> str:
+    return prompt_file.read_bytes().decode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def _read_prompt_dir(prompts_dir: Path, pattern: str) -> Tuple[Tuple[str, str], ...]:
+    # scandir hands back names and file types from one directory read,
+    # where glob would stat every match
+    with os.scandir(prompts_dir) as entries:
+        prompt_files = sorted(
+            entry.path for entry in entries
+            if entry.is_file() and fnmatch(entry.name, pattern)
+        )
+    return tuple(
+        (Path(path).stem, _read_prompt(Path(path)))
+        for path in prompt_files
+    )
+
+
+def load_prompt(prompt_file: str | Path) -> str:
+    """Load prompt template from file, reading each file only once per process"""
+    return _read_prompt(Path(prompt_file).resolve())
+
+
+def load_prompt_dir(prompts_dir: str | Path, pattern: str = "*.md") -> Dict[str, str]:
+    """Load all prompt templates in a directory keyed by file stem"""
+    return dict(_read_prompt_dir(Path(prompts_dir).resolve(), pattern))
+
+
+@lru_cache(maxsize=None)
+def get_prompt_template(template: str, input_variables: Tuple[str, ...]) -> "PromptTemplate":
+    """Build a PromptTemplate once per distinct template text"""
+    # Deferred so callers that only read prompt files don't import LangChain
+    from langchain.prompts import PromptTemplate
+    return PromptTemplate(
+        template=template,
+        input_variables=list(input_variables)
+    )
@@ -1,9 +1,40 @@
-def load_all_files(repo_path):
-    import os
-    docs = []
-    for root, _, files in os.walk(repo_path):
-        for file in files:
-            if file.endswith(".ts") or file.endswith(".js"):
-                with open(os.path.join(root, file), "r") as f:
-                    docs.append(f.read())
-    return docs
\ No newline at end of file
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Tuple
+
+from .fs_walk import SKIPPED_DIRS, VCS_AND_BUILD_DIRS, fingerprint_files, walk_files
+
+# Source files indexed for code retrieval
+SOURCE_SUFFIXES = (".ts", ".js")
+# Vendored, VCS and build/tool output trees; their code would only crowd
+# the index with chunks nobody wrote in this repo
+INDEX_SKIPPED_DIRS = SKIPPED_DIRS | VCS_AND_BUILD_DIRS | {".next", ".turbo", "coverage", "out"}
+# Reads are syscall-bound and release the GIL, so overlap plenty of them
+READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Reads allowed ahead of the consumer, so memory stays flat on large repos
+READ_AHEAD = READ_WORKERS * 2
+
+
+def _read_source(path) -> Tuple[str, str]:
+    # Undecodable bytes are dropped so one bad file can't abort the batch
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return str(path), f.read()
+
+
+def load_all_files(repo_path) -> Iterator[Tuple[str, str]]:
+    """Yield (path, content) for each TypeScript/JavaScript file under repo_path, read concurrently"""
+    paths = walk_files(repo_path, SOURCE_SUFFIXES, INDEX_SKIPPED_DIRS)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+        for path in paths:
+            pending.append(executor.submit(_read_source, path))
+            if len(pending) >= READ_AHEAD:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def repo_fingerprint(repo_path) -> str:
+    """Hash the path, mtime and size of every file load_all_files would read"""
+    return fingerprint_files(walk_files(repo_path, SOURCE_SUFFIXES, INDEX_SKIPPED_DIRS))
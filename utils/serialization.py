@@ -0,0 +1,107 @@
+import datetime
+import enum
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+import yaml
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Use the libyaml C bindings when PyYAML was built with them
+_YAML_DUMPER = getattr(yaml, "CDumper", yaml.Dumper)
+
+
+def to_yaml(data: Any) -> str:
+    """Serialize data to YAML for embedding in a prompt"""
+    return yaml.dump(data, Dumper=_YAML_DUMPER)
+
+
+# Recently dumped objects keyed by id(); the object is held alongside its YAML
+# so the id can't be reused while the entry is cached
+_INTERNED_YAML_SIZE = 16
+_interned_yaml: "OrderedDict[int, Tuple[Any, str]]" = OrderedDict()
+_interned_yaml_lock = threading.Lock()
+
+
+def to_yaml_interned(data: Any) -> str:
+    """
+    Serialize data to YAML, reusing the result for the same object
+
+    Meant for large payloads such as framework_analysis and manual_test that
+    are embedded in several prompts per conversion. The object must not be
+    mutated after it is first dumped.
+    """
+    key = id(data)
+    with _interned_yaml_lock:
+        entry = _interned_yaml.get(key)
+        if entry is not None and entry[0] is data:
+            _interned_yaml.move_to_end(key)
+            return entry[1]
+    
+    text = to_yaml(data)
+    with _interned_yaml_lock:
+        _interned_yaml[key] = (data, text)
+        _interned_yaml.move_to_end(key)
+        while len(_interned_yaml) > _INTERNED_YAML_SIZE:
+            _interned_yaml.popitem(last=False)
+    return text
+
+
+def _json_key(key: Any) -> Any:
+    """Dict key as orjson's OPT_NON_STR_KEYS writes it; json handles str, numbers, bools and None the same way"""
+    if isinstance(key, enum.Enum):
+        return _json_key(key.value)
+    if isinstance(key, (datetime.date, datetime.time)):
+        return key.isoformat()
+    if isinstance(key, uuid.UUID):
+        return str(key)
+    return key
+
+
+def _with_json_keys(data: Any) -> Any:
+    if isinstance(data, dict):
+        return {_json_key(key): _with_json_keys(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_with_json_keys(item) for item in data]
+    return data
+
+
+def dumps_json(data: Any, indent: bool = False) -> str:
+    """
+    Serialize data to a JSON string, using orjson when installed
+
+    The stdlib fallback produces the same text: compact separators, or two
+    space indents, and the same handling of non-str keys.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option).decode("utf-8")
+    return json.dumps(
+        _with_json_keys(data),
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        separators=(",", ": ") if indent else (",", ":")
+    )
+
+
+def to_json(data: Optional[Any]) -> str:
+    """Serialize JSON-native data (HAR, DOM) for embedding in a prompt"""
+    if not data:
+        return "None"
+    return dumps_json(data)
+
+
+def load_json_file(path: str) -> Any:
+    """Parse a JSON file, using orjson straight from bytes when installed"""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,23 @@
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator, Union
+
+# Files at least this large are memory-mapped instead of read
+MMAP_MIN_BYTES = 256 * 1024
+
+
+@contextmanager
+def source_bytes(path: str | os.PathLike) -> Iterator[Union[bytes, mmap.mmap]]:
+    """
+    Yield a file's raw bytes, memory-mapped when it is large
+
+    Scan the result with bytes-mode stdlib patterns and decode only what they
+    capture. Mapping small (or empty) files costs more than reading them.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_BYTES:
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
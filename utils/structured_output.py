@@ -0,0 +1,78 @@
+from typing import AsyncIterator, List, Tuple, Type, TypeVar
+from langchain.schema.messages import BaseMessage
+from langchain.schema.runnable import Runnable, RunnableLambda
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langchain_core.utils.json import parse_partial_json
+from pydantic import BaseModel
+
+Model = TypeVar("Model", bound=BaseModel)
+
+# Partial arguments are re-parsed only after growing by at least this many
+# characters, or by 1/PARTIAL_PARSE_GROWTH_DIVISOR of their length if larger
+PARTIAL_PARSE_MIN_CHARS = 256
+PARTIAL_PARSE_GROWTH_DIVISOR = 4
+
+
+def bind_schema(llm, schema: Type[BaseModel]) -> Tuple[Runnable, str]:
+    """Bind schema as a tool the model must call; returns the bound model and tool name"""
+    tool = convert_to_openai_tool(schema)
+    tool_name = tool["function"]["name"]
+    return llm.bind_tools([tool], tool_choice=tool_name), tool_name
+
+
+def with_validated_output(llm, schema: Type[Model]) -> Runnable:
+    """
+    Force a tool call matching schema and validate its raw JSON arguments
+
+    Drop-in for llm.with_structured_output(schema): the arguments string goes
+    straight to schema.model_validate_json, which parses and validates in one
+    pass instead of json.loads followed by building the model from a dict.
+    """
+    bound, tool_name = bind_schema(llm, schema)
+
+    def validate(message: BaseMessage) -> Model:
+        for tool_call in message.additional_kwargs.get("tool_calls", []):
+            if tool_call["function"]["name"] == tool_name:
+                return schema.model_validate_json(tool_call["function"]["arguments"])
+        raise ValueError(f"Model reply has no {tool_name} tool call")
+
+    return bound | RunnableLambda(validate)
+
+
+async def astream_tool_arguments(
+    llm,
+    schema: Type[BaseModel],
+    messages
+) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Stream a forced schema tool call as (raw JSON so far, partially parsed arguments)
+
+    Nested objects and list items are complete once a later sibling has
+    started, so callers can act on them before the reply finishes. The last
+    raw string yielded is the full arguments JSON.
+    """
+    bound, _ = bind_schema(llm, schema)
+    parts: List[str] = []
+    received = 0
+    parse_at = 0
+    yielded = 0
+    async for chunk in bound.astream(messages):
+        delta = "".join(tool_chunk.get("args") or "" for tool_chunk in chunk.tool_call_chunks)
+        if not delta:
+            continue
+        parts.append(delta)
+        received += len(delta)
+        if received < parse_at:
+            continue
+        # Each parse reads the whole reply so far; spacing parses out
+        # geometrically keeps the total parsing work linear in reply size
+        parse_at = received + max(PARTIAL_PARSE_MIN_CHARS, received // PARTIAL_PARSE_GROWTH_DIVISOR)
+        raw = "".join(parts)
+        arguments = parse_partial_json(raw)
+        if arguments:
+            yielded = received
+            yield raw, arguments
+
+    if received and yielded != received:
+        raw = "".join(parts)
+        yield raw, parse_partial_json(raw) or {}
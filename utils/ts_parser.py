@@ -0,0 +1,69 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+try:
+    from tree_sitter_languages import get_language, get_parser
+except ImportError:  # pragma: no cover - tree-sitter is optional
+    get_language = get_parser = None
+
+# One query collects every node the page object extractor reads, so each
+# file is parsed and walked once
+PAGE_OBJECT_QUERY = """
+(export_statement (class_declaration name: (type_identifier) @class))
+(export_statement (lexical_declaration (variable_declarator name: (identifier) @locator value: (string))))
+(method_definition name: (property_identifier) @method)
+"""
+
+
+@dataclass
+class ParsedPageObject:
+    name: str
+    locators: Dict[str, str]
+    methods: List[str]
+
+
+@lru_cache(maxsize=None)
+def _ts_parser():
+    # Parsers can't be pickled, so each worker process builds its own
+    return get_parser("typescript"), get_language("typescript").query(PAGE_OBJECT_QUERY)
+
+
+def ts_parser_available() -> bool:
+    return get_parser is not None
+
+
+def _text(node, source: bytes) -> str:
+    return source[node.start_byte:node.end_byte].decode("utf-8", errors="ignore")
+
+
+def _is_async(method) -> bool:
+    return any(child.type == "async" for child in method.children)
+
+
+def parse_page_object(source: bytes) -> Optional[ParsedPageObject]:
+    """
+    Extract a page object's class name, exported locators and async methods
+
+    Takes the file's raw bytes, which is what tree-sitter parses. Returns
+    None when the file exports no class. Check ts_parser_available() first;
+    this needs tree_sitter_languages.
+    """
+    parser, query = _ts_parser()
+    tree = parser.parse(source)
+
+    name: Optional[str] = None
+    locators: Dict[str, str] = {}
+    methods: List[str] = []
+    for node, capture in query.captures(tree.root_node):
+        if capture == "class":
+            # First exported class is the page object
+            name = name or _text(node, source)
+        elif capture == "locator":
+            locators[_text(node, source)] = _text(node.parent.child_by_field_name("value"), source)[1:-1]
+        elif _is_async(node.parent):
+            methods.append(_text(node, source))
+
+    if name is None:
+        return None
+    return ParsedPageObject(name=name, locators=locators, methods=methods)
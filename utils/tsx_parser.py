@@ -0,0 +1,159 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+try:
+    from tree_sitter_languages import get_language, get_parser
+except ImportError:  # pragma: no cover - tree-sitter is optional
+    get_language = get_parser = None
+
+# One query collects every node the component extractors read, so each file
+# is parsed and walked once
+COMPONENT_QUERY = """
+(export_statement (lexical_declaration (variable_declarator name: (identifier) @component)))
+(export_statement (function_declaration name: (identifier) @component))
+(export_statement (class_declaration name: (type_identifier) @component))
+(interface_declaration name: (type_identifier) @interface)
+(jsx_attribute) @attribute
+(jsx_opening_element name: (identifier) @element)
+(jsx_self_closing_element name: (identifier) @element)
+(call_expression function: (_) @callee)
+"""
+
+SELECTOR_PATH_PATTERN = re.compile(r"state\.(\w+)\.(\w+)")
+AXIOS_METHODS = frozenset({"get", "post", "put", "patch", "delete"})
+STRING_NODE_TYPES = frozenset({"string", "template_string"})
+
+
+@dataclass
+class ParsedComponent:
+    name: str
+    props: List[str]
+    test_id: Optional[str]
+    state: Dict[str, dict]
+    child_names: List[str]
+    events: Dict[str, dict]
+    api_endpoints: Dict[str, dict]
+
+
+def tsx_parser_available() -> bool:
+    return get_parser is not None
+
+
+@lru_cache(maxsize=None)
+def _tsx_parser():
+    # Parsers can't be pickled, so each worker process builds its own
+    return get_parser("tsx"), get_language("tsx").query(COMPONENT_QUERY)
+
+
+def _text(node, source: bytes) -> str:
+    return source[node.start_byte:node.end_byte].decode("utf-8")
+
+
+def _string_value(node, source: bytes) -> Optional[str]:
+    if node is None or node.type not in STRING_NODE_TYPES:
+        return None
+    return _text(node, source)[1:-1]
+
+
+def _interface_props(name_node, source: bytes) -> List[str]:
+    body = name_node.parent.child_by_field_name("body")
+    if body is None:
+        return []
+    return [
+        _text(member.child_by_field_name("name"), source)
+        for member in body.named_children
+        if member.type == "property_signature"
+    ]
+
+
+def _read_attribute(node, source: bytes, component: ParsedComponent) -> None:
+    if not node.named_children:
+        return
+    name = _text(node.named_children[0], source)
+    value = node.named_children[1] if len(node.named_children) > 1 else None
+    if name == "data-testid" and component.test_id is None:
+        component.test_id = _string_value(value, source)
+    elif name.startswith("on") and value is not None and value.type == "jsx_expression":
+        handler = value.named_children[0] if value.named_children else None
+        if handler is not None and handler.type in ("identifier", "member_expression"):
+            component.events[_text(handler, source)] = {"event": name}
+
+
+def _read_call(callee, source: bytes, component: ParsedComponent) -> None:
+    call = callee.parent
+    arguments = call.child_by_field_name("arguments")
+    if arguments is None:
+        return
+    function = _text(callee, source)
+
+    if function == "useState":
+        declarator = call.parent
+        if declarator is None or declarator.type != "variable_declarator":
+            return
+        pattern = declarator.child_by_field_name("name")
+        if pattern is None or pattern.type != "array_pattern" or not pattern.named_children:
+            return
+        component.state[_text(pattern.named_children[0], source)] = {
+            "type": "local",
+            "default": _text(arguments, source)[1:-1]
+        }
+    elif function == "useSelector":
+        match = SELECTOR_PATH_PATTERN.search(_text(arguments, source))
+        if match:
+            component.state[f"{match.group(1)}.{match.group(2)}"] = {
+                "type": "redux",
+                "selector": f"state.{match.group(1)}.{match.group(2)}"
+            }
+    elif function == "fetch" or function.startswith("axios."):
+        method = "get" if function == "fetch" else function[len("axios."):]
+        if method not in AXIOS_METHODS or not arguments.named_children:
+            return
+        url = _string_value(arguments.named_children[0], source)
+        if url:
+            component.api_endpoints[url] = {"method": method.upper()}
+
+
+def parse_component(content: str) -> Optional[ParsedComponent]:
+    """
+    Extract component details from TSX source with a single tree-sitter parse
+
+    Returns None when the file exports no component. Call
+    tsx_parser_available() first; this needs tree_sitter_languages.
+    """
+    parser, query = _tsx_parser()
+    source = content.encode("utf-8")
+    tree = parser.parse(source)
+
+    component: Optional[ParsedComponent] = None
+    props: Optional[List[str]] = None
+    child_names: Dict[str, None] = {}
+    captures = query.captures(tree.root_node)
+
+    for node, capture in captures:
+        if capture == "component":
+            component = ParsedComponent(
+                name=_text(node, source), props=[], test_id=None, state={},
+                child_names=[], events={}, api_endpoints={}
+            )
+            break
+    if component is None:
+        return None
+
+    for node, capture in captures:
+        if capture == "interface":
+            if props is None and _text(node, source).endswith("Props"):
+                props = _interface_props(node, source)
+        elif capture == "attribute":
+            _read_attribute(node, source, component)
+        elif capture == "element":
+            name = _text(node, source)
+            if name[:1].isupper():
+                child_names[name] = None
+        elif capture == "callee":
+            _read_call(node, source, component)
+
+    component.props = props or []
+    component.child_names = list(child_names)
+    return component
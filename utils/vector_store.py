@@ -1,12 +1,221 @@
+import asyncio
+import hashlib
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import faiss
+import numpy as np
+from langchain.docstore import InMemoryDocstore
 from langchain.vectorstores import FAISS
-from langchain.embeddings import OpenAIEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.schema import Document
+from langchain.storage import LocalFileStore
+from langchain.text_splitter import Language, RecursiveCharacterTextSplitter
+from langchain_openai import OpenAIEmbeddings
 
-def index_repo_code(repo_path):
+from .serialization import dumps_json, load_json_file
+
+INDEX_DIR = Path("vector_repo_index")
+# Fingerprint of the sources and settings the saved index was built from
+INDEX_FINGERPRINT_FILE = INDEX_DIR / ".fingerprint"
+# Content hash and chunk count of every indexed file, so a changed repo only
+# re-embeds and replaces the chunks of the files that changed
+INDEX_MANIFEST_FILE = INDEX_DIR / "manifest.json"
+# Bump when splitting or index layout changes so saved indexes are rebuilt
+INDEX_VERSION = 2
+EMBEDDING_MODEL = "text-embedding-3-small"
+# Truncated from the model's native 1536; a third of the index size and search cost
+EMBEDDING_DIMENSIONS = 512
+# Vectors of previously embedded chunks, keyed by a hash of the chunk text
+EMBEDDING_CACHE_DIR = Path(".cache") / "embeddings"
+# Chunks per embeddings request, and per add to the index
+INDEX_BATCH_SIZE = 512
+# Embedding requests in flight at once
+MAX_CONCURRENT_EMBEDDINGS = 4
+# IVF-PQ layout: vectors are bucketed into IVF_LISTS cells and each stored as
+# PQ_SUBQUANTIZERS bytes; searches visit IVF_PROBES cells
+IVF_LISTS = 256
+PQ_SUBQUANTIZERS = 16
+PQ_BITS = 8
+IVF_PROBES = 8
+# Below ~39 training vectors per cell, IVF-PQ can't be trained well and a
+# flat index is fast enough anyway
+IVF_PQ_MIN_VECTORS = IVF_LISTS * 39
+
+
+def _index_settings() -> str:
+    return f"{INDEX_VERSION}:{EMBEDDING_MODEL}:{EMBEDDING_DIMENSIONS}"
+
+
+def _index_fingerprint(repo_path) -> str:
+    from .repo_loader import repo_fingerprint
+    return f"{_index_settings()}:{repo_fingerprint(repo_path)}"
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _chunk_id(path: str, content_hash: str, position: int) -> str:
+    # The content hash keeps a file's new chunks from colliding with the old ones they replace
+    return f"{path}#{content_hash}#{position}"
+
+
+def _stale_chunk_ids(manifest: Dict[str, dict], files: Dict[str, dict]) -> List[str]:
+    """Chunk ids of files that were edited or removed since the manifest was written"""
+    return [
+        _chunk_id(path, entry["hash"], position)
+        for path, entry in manifest.items()
+        if files.get(path) != entry
+        for position in range(entry["chunks"])
+    ]
+
+
+def _iter_changed_chunks(repo_path, splitter, manifest: Dict[str, dict], files: Dict[str, dict]) -> Iterator[Tuple[str, Document]]:
+    """
+    (chunk id, chunk) for each file that is new or edited since the manifest
+
+    Fills files with the hash and chunk count of every file read, unchanged
+    ones included, as the manifest to save with the updated index.
+    """
     from .repo_loader import load_all_files
-    documents = load_all_files(repo_path)
-    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-    chunks = splitter.create_documents(documents)
-    embeddings = OpenAIEmbeddings()
-    db = FAISS.from_documents(chunks, embeddings)
-    db.save_local("vector_repo_index")
\ No newline at end of file
+    for path, content in load_all_files(repo_path):
+        content_hash = _content_hash(content)
+        entry = manifest.get(path)
+        if entry is not None and entry["hash"] == content_hash:
+            files[path] = entry
+            continue
+        texts = splitter.split_text(content)
+        files[path] = {"hash": content_hash, "chunks": len(texts)}
+        for position, text in enumerate(texts):
+            yield _chunk_id(path, content_hash, position), Document(page_content=text, metadata={"source": path})
+
+
+def _load_index(embeddings) -> Tuple[FAISS, Dict[str, dict]]:
+    """
+    The saved index and its manifest, or an empty index and manifest
+
+    The index is only ever written by aindex_repo_code, so its pickled
+    docstore is trusted. Indexes built with other settings start over.
+    """
+    try:
+        manifest = load_json_file(str(INDEX_MANIFEST_FILE))
+        if manifest.get("settings") == _index_settings():
+            db = FAISS.load_local(str(INDEX_DIR), embeddings, allow_dangerous_deserialization=True)
+            return db, manifest["files"]
+    except (OSError, ValueError, RuntimeError):
+        pass
+    # Faiss ids are assigned explicitly so they stay stable as chunks are removed
+    index = faiss.IndexIDMap2(faiss.IndexFlatL2(EMBEDDING_DIMENSIONS))
+    return FAISS(embeddings, index, InMemoryDocstore(), {}), {}
+
+
+def _remove_chunks(db: FAISS, chunk_ids: List[str]) -> None:
+    stale = set(chunk_ids)
+    faiss_ids = [faiss_id for faiss_id, chunk_id in db.index_to_docstore_id.items() if chunk_id in stale]
+    if not faiss_ids:
+        return
+    db.index.remove_ids(np.array(faiss_ids, dtype=np.int64))
+    db.docstore.delete([db.index_to_docstore_id.pop(faiss_id) for faiss_id in faiss_ids])
+
+
+def _add_chunks(db: FAISS, chunks: List[Tuple[str, Document]], vectors: List[List[float]], first_id: int) -> None:
+    faiss_ids = np.arange(first_id, first_id + len(chunks), dtype=np.int64)
+    db.index.add_with_ids(np.array(vectors, dtype=np.float32), faiss_ids)
+    db.docstore.add(dict(chunks))
+    db.index_to_docstore_id.update(zip(faiss_ids.tolist(), (chunk_id for chunk_id, _ in chunks)))
+
+
+def _cached_embeddings() -> CacheBackedEmbeddings:
+    """OpenAI embeddings that only call the API for chunks not seen in earlier runs"""
+    return CacheBackedEmbeddings.from_bytes_store(
+        OpenAIEmbeddings(
+            model=EMBEDDING_MODEL,
+            dimensions=EMBEDDING_DIMENSIONS,
+            chunk_size=INDEX_BATCH_SIZE,
+            max_retries=6,
+            request_timeout=60
+        ),
+        LocalFileStore(str(EMBEDDING_CACHE_DIR)),
+        namespace=f"{EMBEDDING_MODEL}-{EMBEDDING_DIMENSIONS}"
+    )
+
+
+async def _aembed_batches(embeddings: CacheBackedEmbeddings, batches: List[List[Document]]) -> List[List[List[float]]]:
+    """Embed each batch in its own request, all concurrently"""
+    return await asyncio.gather(*(
+        embeddings.aembed_documents([chunk.page_content for chunk in batch])
+        for batch in batches
+    ))
+
+
+def _compress_index(db: FAISS) -> None:
+    """
+    Swap the exact flat index for IVF-PQ once it holds enough vectors to train one
+
+    Called after every batch, so the switch happens as soon as the flat index
+    reaches IVF_PQ_MIN_VECTORS. Those vectors are the training sample; every
+    later batch is added straight into the IVF-PQ index, so the repo's full
+    set of vectors is never held uncompressed.
+    """
+    if isinstance(db.index, faiss.IndexIVF) or db.index.ntotal < IVF_PQ_MIN_VECTORS:
+        return
+    flat = faiss.downcast_index(db.index.index)
+    vectors = flat.reconstruct_n(0, flat.ntotal)
+    index = faiss.IndexIVFPQ(faiss.IndexFlatL2(flat.d), flat.d, IVF_LISTS, PQ_SUBQUANTIZERS, PQ_BITS)
+    index.train(vectors)
+    # Same faiss ids, so index_to_docstore_id still lines up
+    index.add_with_ids(vectors, faiss.vector_to_array(db.index.id_map))
+    index.nprobe = IVF_PROBES
+    db.index = index
+
+
+def index_repo_code(repo_path):
+    """Build and save the FAISS index of a repo's TypeScript/JavaScript code"""
+    return asyncio.run(aindex_repo_code(repo_path))
+
+
+async def aindex_repo_code(repo_path):
+    """
+    Build or update the saved FAISS index of a repo's TypeScript/JavaScript code
+
+    Files are split as they are read and embedded a window of batches at a
+    time, so memory holds at most MAX_CONCURRENT_EMBEDDINGS batches of chunks
+    rather than the whole repo. Nothing is touched while no source file has
+    changed since the saved index. Otherwise the saved index is updated in
+    place: only new or edited files are split and embedded, and the chunks of
+    edited or removed files are deleted.
+    """
+    fingerprint = _index_fingerprint(repo_path)
+    try:
+        if INDEX_FINGERPRINT_FILE.read_text(encoding="utf-8") == fingerprint:
+            return
+    except OSError:
+        pass
+
+    # Split at class/function/statement boundaries; TypeScript shares JS's syntax for these
+    splitter = RecursiveCharacterTextSplitter.from_language(
+        Language.JS, chunk_size=1000, chunk_overlap=100
+    )
+    embeddings = _cached_embeddings()
+    db, manifest = _load_index(embeddings)
+    next_id = max(db.index_to_docstore_id, default=-1) + 1
+    files: Dict[str, dict] = {}
+    chunks = _iter_changed_chunks(repo_path, splitter, manifest, files)
+    while True:
+        batches = [list(islice(chunks, INDEX_BATCH_SIZE)) for _ in range(MAX_CONCURRENT_EMBEDDINGS)]
+        batches = [batch for batch in batches if batch]
+        if not batches:
+            break
+        documents = [[chunk for _, chunk in batch] for batch in batches]
+        for batch, vectors in zip(batches, await _aembed_batches(embeddings, documents)):
+            _add_chunks(db, batch, vectors, next_id)
+            next_id += len(batch)
+            _compress_index(db)
+    # Every file has been read by now, so files also tells which ones were removed
+    _remove_chunks(db, _stale_chunk_ids(manifest, files))
+
+    db.save_local(str(INDEX_DIR))
+    INDEX_MANIFEST_FILE.write_text(dumps_json({"settings": _index_settings(), "files": files}), encoding="utf-8")
+    INDEX_FINGERPRINT_FILE.write_text(fingerprint, encoding="utf-8")